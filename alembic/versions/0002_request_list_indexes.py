@@ -0,0 +1,32 @@
+"""request list indexes: role-scoped GET /api/requests in keyset order
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_requests_client_created_at', 'requests', ['client_id', 'created_at', 'id'])
+    create_index_concurrently('ix_requests_executor_status_created_at', 'requests', ['executor_id', 'status', 'created_at', 'id'], postgresql_where=sa.text('executor_id IS NOT NULL'))
+    create_index_concurrently('ix_requests_status_created_at', 'requests', ['status', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_requests_status_created_at', 'requests')
+    drop_index_concurrently('ix_requests_executor_status_created_at', 'requests')
+    drop_index_concurrently('ix_requests_client_created_at', 'requests')
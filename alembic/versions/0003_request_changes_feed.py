@@ -0,0 +1,74 @@
+"""request changes feed: version column, tombstones
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    if is_postgresql:
+        op.execute("CREATE SEQUENCE IF NOT EXISTS request_version_seq")
+
+    op.create_table('request_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('executor_id', sa.Integer(), nullable=True),
+    sa.Column('reason', sa.Enum('DELETED', 'UNASSIGNED', name='tombstonereason'), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_request_tombstones_version', 'request_tombstones', ['version'], unique=True)
+
+    # Existing rows get versions in id order, then the column becomes NOT NULL
+    op.add_column('requests', sa.Column('version', sa.BigInteger(), nullable=True))
+    if is_postgresql:
+        op.execute(
+            "UPDATE requests SET version = numbered.version FROM "
+            "(SELECT id, nextval('request_version_seq') AS version FROM "
+            "(SELECT id FROM requests ORDER BY id) AS ordered) AS numbered "
+            "WHERE requests.id = numbered.id"
+        )
+    else:
+        op.execute("UPDATE requests SET version = id")
+    with op.batch_alter_table('requests') as batch_op:
+        batch_op.alter_column('version', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.alter_column(
+            'updated_at', existing_type=sa.DateTime(timezone=True), server_default=sa.func.now()
+        )
+
+    create_index_concurrently('ix_requests_version', 'requests', ['version'], unique=True)
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    drop_index_concurrently('ix_requests_version', 'requests')
+    with op.batch_alter_table('requests') as batch_op:
+        batch_op.alter_column(
+            'updated_at', existing_type=sa.DateTime(timezone=True), server_default=None
+        )
+        batch_op.drop_column('version')
+    op.drop_index('ix_request_tombstones_version', table_name='request_tombstones')
+    op.drop_table('request_tombstones')
+
+    if is_postgresql:
+        op.execute("DROP TYPE IF EXISTS tombstonereason")
+        op.execute("DROP SEQUENCE IF EXISTS request_version_seq")
@@ -0,0 +1,38 @@
+"""executor skills for automatic dispatch
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REQUEST_TYPES = ('PLUMBING', 'ELECTRICITY', 'ELEVATOR', 'CLEANING', 'HEATING', 'OTHER')
+
+
+def upgrade() -> None:
+    # requesttype already exists on PostgreSQL (created with requests)
+    request_type = sa.Enum(*REQUEST_TYPES, name='requesttype').with_variant(
+        postgresql.ENUM(*REQUEST_TYPES, name='requesttype', create_type=False), 'postgresql'
+    )
+    op.create_table('executor_skills',
+    sa.Column('executor_id', sa.Integer(), nullable=False),
+    sa.Column('type', request_type, nullable=False),
+    sa.ForeignKeyConstraint(['executor_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('executor_id', 'type')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('executor_skills')
@@ -0,0 +1,30 @@
+"""partial index on the deadline of open requests (SLA monitor)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_REQUESTS = "status NOT IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_requests_open_deadline', 'requests', ['deadline'], postgresql_where=sa.text(OPEN_REQUESTS), sqlite_where=sa.text(OPEN_REQUESTS))
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_requests_open_deadline', 'requests')
@@ -0,0 +1,31 @@
+"""priority queue index of open requests
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_REQUESTS = "status NOT IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    # Expressions of models.request_queue_key()
+    create_index_concurrently('ix_requests_open_queue', 'requests', [sa.text('(-priority)'), sa.text("COALESCE(deadline, 'infinity')"), 'id'], postgresql_where=sa.text(OPEN_REQUESTS), sqlite_where=sa.text(OPEN_REQUESTS))
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_requests_open_queue', 'requests')
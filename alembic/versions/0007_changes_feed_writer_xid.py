@@ -0,0 +1,45 @@
+"""request changes feed: writing transaction of each version
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('requests', 'request_tombstones')
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    # Existing versions are all committed: transaction 0 keeps them in version
+    # order, before any new write. A constant default does not rewrite the table
+    for table in TABLES:
+        op.add_column(table, sa.Column('version_xid', sa.BigInteger(), server_default='0', nullable=False))
+        if is_postgresql:
+            # Writers set it (models.current_transaction_id); SQLite keeps 0
+            op.alter_column(table, 'version_xid', server_default=None)
+
+    create_index_concurrently('ix_requests_version_xid', 'requests', ['version_xid', 'version'])
+    create_index_concurrently('ix_request_tombstones_version_xid', 'request_tombstones', ['version_xid', 'version'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_request_tombstones_version_xid', 'request_tombstones')
+    drop_index_concurrently('ix_requests_version_xid', 'requests')
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('version_xid')
@@ -0,0 +1,27 @@
+"""keyset pagination indexes: GET /api/requests and GET /api/users
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_requests_created_at_id', 'requests', ['created_at', 'id'])
+    create_index_concurrently('ix_users_created_at_id', 'users', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_users_created_at_id', 'users')
+    drop_index_concurrently('ix_requests_created_at_id', 'requests')
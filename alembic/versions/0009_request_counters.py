@@ -0,0 +1,42 @@
+"""materialized request counters (dashboard statistics)
+
+The API fills the table from the requests on startup while it is empty
+(stats.rebuild_request_counters).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 20:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import has_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if has_table('request_counters'):
+        return
+    op.create_table('request_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('dimension', 'key', name='uq_request_counters_dimension_key')
+    )
+    op.create_index(op.f('ix_request_counters_id'), 'request_counters', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_request_counters_id'), table_name='request_counters')
+    op.drop_table('request_counters')
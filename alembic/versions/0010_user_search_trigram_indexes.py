@@ -0,0 +1,38 @@
+"""trigram indexes for substring search of GET /api/users (PostgreSQL)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 20:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Other databases search with a sequential scan
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    create_index_concurrently('ix_users_username_trgm', 'users', ['username'], postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+    create_index_concurrently('ix_users_fullname_trgm', 'users', ['fullname'], postgresql_using='gin', postgresql_ops={'fullname': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    # The extension stays: other objects of the database may use it
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    drop_index_concurrently('ix_users_fullname_trgm', 'users')
+    drop_index_concurrently('ix_users_username_trgm', 'users')
@@ -0,0 +1,50 @@
+"""full-text search vector of requests (GET /api/requests/search)
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 20:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migration_helpers import create_index_concurrently, drop_index_concurrently, has_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# search.request_vector() as SQL: description (weight A) plus all comments (weight B)
+REQUEST_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'A') || "
+    "coalesce(setweight(to_tsvector('russian', "
+    "(SELECT string_agg(comments.text, ' ') FROM comments WHERE comments.request_id = requests.id)), 'B'), "
+    "to_tsvector('russian', ''))"
+)
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    if not has_column('requests', 'search_vector'):
+        op.add_column('requests', sa.Column('search_vector', postgresql.TSVECTOR().with_variant(sa.Text(), 'sqlite'), nullable=True))
+    if not is_postgresql:
+        # Other databases search descriptions with ILIKE and leave the column empty
+        return
+
+    # Existing requests; version stays, so the changes feed does not resend them
+    op.execute(f"UPDATE requests SET search_vector = {REQUEST_VECTOR} WHERE search_vector IS NULL")
+    create_index_concurrently('ix_requests_search_vector', 'requests', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        drop_index_concurrently('ix_requests_search_vector', 'requests')
+    with op.batch_alter_table('requests') as batch_op:
+        batch_op.drop_column('search_vector')
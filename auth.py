@@ -1,15 +1,20 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from database import get_db
 from models import User, UserRole
-from schemas import TokenData
+from schemas import TokenData, AuthenticatedUser
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -28,6 +33,163 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt hashing/verification.
+    
+    bcrypt costs ~200ms of CPU per call, so running it inline in an async
+    handler freezes every other request on the worker. Calls are submitted
+    to a thread or process pool; once more than `max_queue` calls are
+    waiting, new ones are rejected with 503 instead of piling up.
+    """
+    
+    def __init__(self, kind: str, workers: int, max_queue: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwd-hash")
+        return self._executor
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted calls waiting for a free worker"""
+        return max(0, self.in_flight - self.workers)
+    
+    async def run(self, func, *args):
+        """Run func(*args) in the pool, respecting the queue limit"""
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        
+        self.in_flight += 1
+        self.submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+    
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hash_pool = PasswordHashPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+class UserCache:
+    """
+    In-process TTL/LRU cache of the fields needed for authorization.
+    
+    Removes the per-request user lookup from get_current_user. Entries must
+    be invalidated whenever role/status/is_active change or the user is
+    deleted; the TTL bounds staleness across uvicorn workers.
+    """
+    
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, user_id: int) -> Optional[AuthenticatedUser]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, user: AuthenticatedUser):
+        if self.max_size <= 0:
+            return
+        self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, user_id: int):
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+user_cache = UserCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
 
@@ -46,7 +208,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
     """
     Authenticate user by username and password
     
@@ -58,12 +220,13 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     Returns:
         User object if authentication successful, None otherwise
     """
-    user = db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
     
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     
     if not user.is_active:
@@ -74,8 +237,8 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> AuthenticatedUser:
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -83,6 +246,18 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    return await authenticate_token(credentials.credentials, db)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> AuthenticatedUser:
+    """
+    Resolve a JWT access token to its user
+    
+    Used directly where no Authorization header is available (WebSocket).
+    
+    Raises:
+        HTTPException: If the token is invalid or the user is inactive
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -90,7 +265,6 @@ async def get_current_user(
     )
 
     try:
-        token = credentials.credentials
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
@@ -106,10 +280,19 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
 
     if user is None:
-        raise credentials_exception
+        result = await db.execute(
+            select(User.id, User.role, User.status, User.is_active).where(User.id == user_id)
+        )
+        row = result.first()
+
+        if row is None:
+            raise credentials_exception
+
+        user = AuthenticatedUser.model_validate(row)
+        user_cache.set(user)
 
     if not user.is_active:
         raise HTTPException(
@@ -121,8 +304,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
     """
     Get current active user
     
@@ -153,7 +336,7 @@ def require_role(allowed_roles: list[UserRole]):
     Returns:
         Dependency function
     """
-    async def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    async def role_checker(current_user: AuthenticatedUser = Depends(get_current_active_user)) -> AuthenticatedUser:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+import sys
+import io
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+"""
+Нагрузочный бенчмарк API УК ЖКХ
+Запустите после запуска основного приложения (python main.py)
+
+Примеры:
+    python bench_api.py
+    python bench_api.py --concurrency 50 --total 2000
+    python bench_api.py --scenario login-burst --logins 200
+    python bench_api.py --scenario pagination --page 10000
+    python bench_api.py --scenario pagination --page 1000 --order priority
+    python bench_api.py --scenario user-search --seed-users 1000000
+    python bench_api.py --scenario serialization --seed-requests 1000 --rows 100,1000
+    python bench_api.py --scenario import --rows 1000,5000
+    python bench_api.py --scenario dispatch --seed-executors 200 --seed-requests 20000 --rows 5000
+    python bench_api.py --scenario assign-batch --seed-executors 200 --seed-requests 5000 --rows 100,1000
+"""
+
+import argparse
+import gzip
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import requests
+
+from pagination import RequestOrder, encode_cursor, encode_queue_cursor
+
+BASE_URL = "http://127.0.0.1:8000"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Перцентиль по отсортированному списку"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class APIBenchmark:
+    def __init__(self, base_url: str, username: str, password: str):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.token: Optional[str] = None
+        self.session = requests.Session()
+
+    def print_header(self, text: str):
+        """Печать заголовка"""
+        print(f"\n{'='*60}")
+        print(f"  {text}")
+        print(f"{'='*60}\n")
+
+    def login(self):
+        """Получить токен для авторизованных запросов"""
+        response = self.session.post(
+            f"{self.base_url}/api/auth/login",
+            json={"username": self.username, "password": self.password}
+        )
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def run(self, name: str, call: Callable[[requests.Session], requests.Response],
+            total: int, concurrency: int):
+        """Выполнить total запросов в concurrency потоков и напечатать статистику"""
+        self.print_header(f"{name}: {total} запросов, {concurrency} параллельно")
+
+        def worker(count: int):
+            session = requests.Session()
+            latencies, errors = [], 0
+            for _ in range(count):
+                started = time.perf_counter()
+                try:
+                    response = call(session)
+                    if response.status_code >= 400:
+                        errors += 1
+                except requests.exceptions.RequestException:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+            return latencies, errors
+
+        per_worker = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(worker, per_worker))
+        elapsed = time.perf_counter() - started
+
+        latencies: List[float] = [value for chunk, _ in results for value in chunk]
+        errors = sum(count for _, count in results)
+
+        print(f"  Время:        {elapsed:.2f} с")
+        print(f"  Пропускная:   {total / elapsed:.1f} запр/с")
+        print(f"  p50:          {percentile(latencies, 50) * 1000:.1f} мс")
+        print(f"  p95:          {percentile(latencies, 95) * 1000:.1f} мс")
+        print(f"  p99:          {percentile(latencies, 99) * 1000:.1f} мс")
+        print(f"  Ошибок:       {errors}")
+
+    def bench_requests_list(self, total: int, concurrency: int):
+        """GET /api/requests"""
+        self.run(
+            "GET /api/requests",
+            lambda s: s.get(f"{self.base_url}/api/requests", headers=self.headers),
+            total, concurrency
+        )
+
+    def bench_login(self, total: int, concurrency: int):
+        """POST /api/auth/login"""
+        payload = {"username": self.username, "password": self.password}
+        self.run(
+            "POST /api/auth/login",
+            lambda s: s.post(f"{self.base_url}/api/auth/login", json=payload),
+            total, concurrency
+        )
+
+    def bench_requests_during_login_burst(self, total: int, concurrency: int, logins: int):
+        """p99 GET /api/requests, пока параллельно идёт волна логинов"""
+        payload = {"username": self.username, "password": self.password}
+
+        def burst():
+            with ThreadPoolExecutor(max_workers=logins) as pool:
+                list(pool.map(
+                    lambda _: requests.post(f"{self.base_url}/api/auth/login", json=payload),
+                    range(logins)
+                ))
+
+        burst_thread = threading.Thread(target=burst)
+        burst_thread.start()
+        try:
+            self.run(
+                f"GET /api/requests во время {logins} параллельных логинов",
+                lambda s: s.get(f"{self.base_url}/api/requests", headers=self.headers),
+                total, concurrency
+            )
+        finally:
+            burst_thread.join()
+
+    def bench_pagination(self, total: int, page: int, limit: int = 100, order: RequestOrder = RequestOrder.CREATED):
+        """Латентность первой и глубокой страницы: offset против cursor"""
+        url = f"{self.base_url}/api/requests"
+
+        # Курсор глубокой страницы строим по последней строке предыдущей страницы
+        response = self.session.get(
+            url, params={"skip": (page - 1) * limit - 1, "limit": 1, "order": order.value}, headers=self.headers
+        )
+        response.raise_for_status()
+        anchor = response.json()
+        if not anchor:
+            print(f"✗ В базе меньше {(page - 1) * limit} заявок, глубокая страница недоступна")
+            return
+        if order == RequestOrder.PRIORITY:
+            deadline = anchor[0]["deadline"]
+            cursor = encode_queue_cursor(
+                anchor[0]["priority"], datetime.fromisoformat(deadline) if deadline else None, anchor[0]["id"]
+            )
+        else:
+            cursor = encode_cursor(datetime.fromisoformat(anchor[0]["created_at"]), anchor[0]["id"])
+
+        self.run(
+            "Страница 1",
+            lambda s: s.get(url, params={"limit": limit, "order": order.value}, headers=self.headers),
+            total, 1
+        )
+        self.run(
+            f"Страница {page} (skip)",
+            lambda s: s.get(
+                url, params={"skip": (page - 1) * limit, "limit": limit, "order": order.value}, headers=self.headers
+            ),
+            total, 1
+        )
+        self.run(
+            f"Страница {page} (cursor)",
+            lambda s: s.get(url, params={"cursor": cursor, "limit": limit, "order": order.value}, headers=self.headers),
+            total, 1
+        )
+
+    def bench_payload(self, total: int, rows: List[int]):
+        """Объем ответа на проводе и латентность GET /api/requests с gzip и без"""
+        url = f"{self.base_url}/api/requests"
+        for limit in rows:
+            for encoding in ("identity", "gzip"):
+                headers = {**self.headers, "Accept-Encoding": encoding}
+                response = self.session.get(url, params={"limit": limit}, headers=headers, stream=True)
+                wire_bytes = len(response.raw.read(decode_content=False))
+                print(f"  {limit} строк, {encoding:8}: {wire_bytes / 1024:8.1f} КБ на проводе")
+                self.run(
+                    f"GET /api/requests?limit={limit} ({encoding})",
+                    lambda s, headers=headers, limit=limit: s.get(url, params={"limit": limit}, headers=headers),
+                    total, 1
+                )
+
+    def bench_user_search(self, total: int, terms: List[str]):
+        """Латентность поиска пользователей GET /api/users?search="""
+        for term in terms:
+            self.run(
+                f"Поиск пользователей: '{term}'",
+                lambda s, term=term: s.get(f"{self.base_url}/api/users", params={"search": term, "limit": 50}, headers=self.headers),
+                total, 1
+            )
+
+    def bench_import(self, rows: List[int], single: int = 200):
+        """Заявок в секунду: POST /api/requests по одной против POST /api/requests/import"""
+        def item(i: int) -> dict:
+            return {"type": "heating", "description": f"Бенчмарк импорта: холодные батареи, квартира {i}"}
+
+        self.print_header("Импорт заявок")
+        started = time.perf_counter()
+        for i in range(single):
+            self.session.post(f"{self.base_url}/api/requests", json=item(i), headers=self.headers).raise_for_status()
+        elapsed = time.perf_counter() - started
+        print(f"  POST /api/requests x{single}: {single / elapsed:10.1f} заявок/с")
+
+        for count in rows:
+            started = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/api/requests/import",
+                json=[item(i) for i in range(count)],
+                headers=self.headers
+            )
+            response.raise_for_status()
+            elapsed = time.perf_counter() - started
+            result = response.json()
+            print(
+                f"  Импорт {count} заявок: {count / elapsed:10.1f} заявок/с с клиента, "
+                f"{result['rows_per_second']:10.1f} на сервере, ошибок: {result['failed']}"
+            )
+
+    def bench_dispatch(self, batch: int):
+        """Раунды POST /api/requests/dispatch, пока есть NEW заявки и свободные исполнители"""
+        self.print_header(f"Автоназначение: по {batch} заявок за раунд")
+        total = 0
+        started = time.perf_counter()
+        while True:
+            response = self.session.post(
+                f"{self.base_url}/api/requests/dispatch", params={"limit": batch}, headers=self.headers
+            )
+            response.raise_for_status()
+            result = response.json()
+            if not result["assigned"]:
+                break
+            total += result["assigned"]
+            print(
+                f"  Назначено {result['assigned']:6}: {result['elapsed_ms']:8.1f} мс, "
+                f"{result['requests_per_second']:10.1f} заявок/с на сервере"
+            )
+        elapsed = time.perf_counter() - started
+        print(f"  Всего назначено: {total}, {total / elapsed:.1f} заявок/с с клиента")
+
+    def bench_assign_batch(self, rows: List[int], single: int = 200):
+        """Назначений в секунду: POST /api/requests/{id}/assign по одному против POST /api/requests/assign-batch"""
+        self.print_header("Пакетное назначение исполнителей")
+        response = self.session.get(f"{self.base_url}/api/executors/workload", headers=self.headers)
+        response.raise_for_status()
+        executors = [executor["id"] for executor in response.json()]
+        response = self.session.get(
+            f"{self.base_url}/api/requests",
+            params={"status_filter": "new", "limit": single + sum(rows)},
+            headers=self.headers
+        )
+        response.raise_for_status()
+        request_ids = [request["id"] for request in response.json()]
+        if not executors or len(request_ids) < single + sum(rows):
+            print("  Мало исполнителей или NEW заявок: используйте --seed-executors и --seed-requests")
+            return
+
+        def executor_for(i: int) -> int:
+            return executors[i % len(executors)]
+
+        started = time.perf_counter()
+        for i, request_id in enumerate(request_ids[:single]):
+            self.session.post(
+                f"{self.base_url}/api/requests/{request_id}/assign",
+                json={"executor_id": executor_for(i)},
+                headers=self.headers
+            ).raise_for_status()
+        elapsed = time.perf_counter() - started
+        print(f"  POST /api/requests/{{id}}/assign x{single}: {single / elapsed:10.1f} назначений/с")
+
+        offset = single
+        for count in rows:
+            batch = [
+                {"request_id": request_id, "executor_id": executor_for(i)}
+                for i, request_id in enumerate(request_ids[offset:offset + count])
+            ]
+            offset += count
+            started = time.perf_counter()
+            response = self.session.post(f"{self.base_url}/api/requests/assign-batch", json=batch, headers=self.headers)
+            response.raise_for_status()
+            elapsed = time.perf_counter() - started
+            result = response.json()
+            print(
+                f"  Пакет из {count}: {count / elapsed:10.1f} назначений/с с клиента, "
+                f"{result['elapsed_ms']:8.1f} мс на сервере, ошибок: {result['failed']}"
+            )
+
+
+def bench_serialization(rows: List[int], repeat: int):
+    """
+    CPU на сериализацию ответа List[RequestWithDetails] (в процессе, без сервера):
+    стандартный путь FastAPI (валидация, dump_python, json.dumps) против
+    dump_json из serialization.py, плюс сжатие gzip
+    """
+    import json
+    from datetime import timedelta
+
+    from pydantic import TypeAdapter
+
+    from config import settings
+    from models import Request, User, RequestStatus, RequestType, UserRole, UserStatus
+    from schemas import RequestWithDetails
+    from serialization import dump_json
+
+    print(f"\n{'='*60}")
+    print(f"  Сериализация List[RequestWithDetails], {repeat} повторов")
+    print(f"{'='*60}\n")
+
+    now = datetime.utcnow()
+    client = User(
+        id=1, username="79161111111", fullname="Иванов Иван Иванович", address="ул. Ленина, д. 10, кв. 25",
+        role=UserRole.CLIENT, status=UserStatus.CONFIRMED, is_active=True, created_at=now
+    )
+    executor = User(
+        id=2, username="79164444444", fullname="Сидоров Петр Алексеевич", address="Главный офис",
+        role=UserRole.EXECUTOR, status=UserStatus.CONFIRMED, is_active=True, created_at=now
+    )
+    adapter = TypeAdapter(List[RequestWithDetails])
+
+    def default_path(data) -> bytes:
+        content = adapter.dump_python(adapter.validate_python(data, from_attributes=True), mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    for count in rows:
+        data = [
+            Request(
+                id=i, client_id=1, executor_id=2, client=client, executor=executor,
+                type=RequestType.PLUMBING, status=RequestStatus.IN_PROGRESS, priority=1, version=i,
+                description=f"Заявка {i}, подъезд {i % 12 + 1}, кв. {i * 7 % 300}: "
+                            + "течет кран на кухне, вода капает постоянно, нужна замена смесителя. " * (1 + i % 3)
+                            + hashlib.md5(str(i).encode()).hexdigest(),
+                created_at=now, updated_at=now, assigned_at=now, started_at=now, deadline=now + timedelta(hours=24)
+            )
+            for i in range(1, count + 1)
+        ]
+
+        for name, serialize in (("FastAPI по умолчанию", default_path),
+                                ("dump_json", lambda data: dump_json(List[RequestWithDetails], data))):
+            started = time.process_time()
+            for _ in range(repeat):
+                body = serialize(data)
+            cpu = (time.process_time() - started) / repeat
+            print(f"  {count:5} строк, {name:20}: {cpu * 1000:7.2f} мс CPU, {len(body) / 1024:8.1f} КБ")
+
+        started = time.process_time()
+        for _ in range(repeat):
+            compressed = gzip.compress(body, compresslevel=settings.GZIP_COMPRESS_LEVEL)
+        cpu = (time.process_time() - started) / repeat
+        print(f"  {count:5} строк, {'+ gzip ' + str(settings.GZIP_COMPRESS_LEVEL):20}: "
+              f"{cpu * 1000:7.2f} мс CPU, {len(compressed) / 1024:8.1f} КБ\n")
+
+
+def seed_requests(count: int):
+    """Добавить count синтетических заявок первого клиента напрямую в БД (только PostgreSQL)"""
+    from sqlalchemy import text
+    from database import engine, SessionLocal
+    from stats import rebuild_request_counters
+
+    with engine.begin() as conn:
+        client_id = conn.scalar(text("SELECT min(id) FROM users WHERE role = 'CLIENT'"))
+        if client_id is None:
+            print("✗ В базе нет клиентов: сначала python seed_data.py")
+            return
+        conn.execute(text("""
+            INSERT INTO requests (client_id, type, description, status, priority, created_at, updated_at, version, version_xid)
+            SELECT
+                :client_id,
+                (ARRAY['PLUMBING', 'ELECTRICITY', 'ELEVATOR', 'CLEANING', 'HEATING', 'OTHER'])[1 + g % 6]::requesttype,
+                'Заявка ' || g || ': течет кран на кухне, вода капает постоянно, нужна замена смесителя. '
+                    || repeat('Подробности проблемы. ', 1 + g % 5),
+                'NEW', 1,
+                now() - g * interval '1 minute',
+                now() - g * interval '1 minute',
+                nextval('request_version_seq'),
+                pg_current_xact_id()::text::bigint
+            FROM generate_series(1, :count) AS g
+        """), {"client_id": client_id, "count": count})
+        conn.execute(text("ANALYZE requests"))
+
+    db = SessionLocal()
+    try:
+        rebuild_request_counters(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"✓ Добавлено заявок: {count}")
+
+
+def seed_users(count: int):
+    """Добавить count синтетических клиентов напрямую в БД (только PostgreSQL)"""
+    from sqlalchemy import text
+    from database import engine
+
+    with engine.begin() as conn:
+        start = conn.scalar(text("SELECT coalesce(max(id), 0) FROM users"))
+        conn.execute(text("""
+            INSERT INTO users (username, hashed_password, fullname, address, role, status, is_active)
+            SELECT
+                '8' || lpad(g::text, 10, '0'),
+                '!',
+                (ARRAY['Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Волков', 'Морозов'])[1 + g % 8]
+                    || ' ' || (ARRAY['Иван', 'Петр', 'Мария', 'Анна', 'Сергей', 'Ольга', 'Дмитрий'])[1 + g % 7]
+                    || ' ' || md5(g::text),
+                'ул. Ленина, д. ' || (g % 200),
+                'CLIENT', 'CONFIRMED', true
+            FROM generate_series(:start + 1, :start + :count) AS g
+        """), {"start": start, "count": count})
+        conn.execute(text("ANALYZE users"))
+    print(f"✓ Добавлено пользователей: {count}")
+
+
+def seed_executors(count: int):
+    """Добавить count исполнителей с 0-2 специализациями напрямую в БД (только PostgreSQL)"""
+    from sqlalchemy import text
+    from database import engine
+
+    with engine.begin() as conn:
+        start = conn.scalar(text("SELECT coalesce(max(id), 0) FROM users"))
+        conn.execute(text("""
+            INSERT INTO users (username, hashed_password, fullname, address, role, status, is_active)
+            SELECT '7' || lpad(g::text, 10, '0'), '!', 'Исполнитель ' || g, 'Аварийная служба',
+                'EXECUTOR', 'CONFIRMED', true
+            FROM generate_series(:start + 1, :start + :count) AS g
+        """), {"start": start, "count": count})
+        # Каждый третий без специализаций (любые заявки), остальные - одна или две
+        conn.execute(text("""
+            INSERT INTO executor_skills (executor_id, type)
+            SELECT DISTINCT id, (ARRAY['PLUMBING', 'ELECTRICITY', 'ELEVATOR', 'CLEANING', 'HEATING', 'OTHER'])[1 + (id + k) % 6]::requesttype
+            FROM users, generate_series(0, 1) AS k
+            WHERE id > :start AND role = 'EXECUTOR' AND id % 3 <> 0 AND (k = 0 OR id % 2 = 0)
+        """), {"start": start})
+    print(f"✓ Добавлено исполнителей: {count}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк API УК ЖКХ")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--username", default="1488")
+    parser.add_argument("--password", default="0000")
+    parser.add_argument("--total", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--page", type=int, default=10000)
+    parser.add_argument("--order", type=RequestOrder, default=RequestOrder.CREATED, choices=list(RequestOrder),
+                        help="порядок списка заявок (pagination)")
+    parser.add_argument("--seed-users", type=int, default=0, help="сначала добавить N пользователей в БД")
+    parser.add_argument("--seed-requests", type=int, default=0, help="сначала добавить N заявок в БД")
+    parser.add_argument("--seed-executors", type=int, default=0, help="сначала добавить N исполнителей в БД")
+    parser.add_argument("--rows", default="100,1000", help="размеры списка (serialization), импорта (import), раунда (dispatch) или пакета (assign-batch)")
+    parser.add_argument("--scenario", default="throughput",
+                        choices=["throughput", "login-burst", "pagination", "user-search", "serialization", "import", "dispatch", "assign-batch"])
+    args = parser.parse_args()
+
+    if args.seed_users:
+        seed_users(args.seed_users)
+    if args.seed_requests:
+        seed_requests(args.seed_requests)
+    if args.seed_executors:
+        seed_executors(args.seed_executors)
+
+    rows = [int(value) for value in args.rows.split(",")]
+    if args.scenario == "serialization":
+        bench_serialization(rows, repeat=20)
+
+    bench = APIBenchmark(args.url, args.username, args.password)
+    try:
+        bench.login()
+        if args.scenario == "throughput":
+            bench.bench_requests_list(args.total, args.concurrency)
+            bench.bench_login(max(args.total // 10, args.concurrency), args.concurrency)
+        elif args.scenario == "login-burst":
+            bench.bench_requests_list(args.total, args.concurrency)
+            bench.bench_requests_during_login_burst(args.total, args.concurrency, args.logins)
+        elif args.scenario == "pagination":
+            bench.bench_pagination(min(args.total, 100), args.page, order=args.order)
+        elif args.scenario == "user-search":
+            bench.bench_user_search(min(args.total, 100), ["Иван", "ова", "8000001", "Сидоров Мар"])
+        elif args.scenario == "serialization":
+            bench.bench_payload(min(args.total, 50), rows)
+        elif args.scenario == "import":
+            bench.bench_import(rows)
+        elif args.scenario == "dispatch":
+            bench.bench_dispatch(rows[0])
+        elif args.scenario == "assign-batch":
+            bench.bench_assign_batch(rows)
+    except requests.exceptions.ConnectionError:
+        print("\n✗ Не удалось подключиться к API!")
+        print("  Убедитесь, что сервер запущен: python main.py")
@@ -0,0 +1,145 @@
+"""
+Bulk import of requests (POST /api/requests/import)
+
+Items arrive as a JSON array or as NDJSON (one object per line), are
+validated one by one and inserted with a single executemany INSERT ...
+RETURNING: SQLAlchemy sends IMPORT_BATCH_SIZE rows per statement, so
+importing thousands of requests costs a few round trips instead of a
+commit per request.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Set, Tuple
+
+from fastapi import HTTPException, Request as HTTPRequest, status
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Request, RequestStatus, User
+from schemas import RequestImportError, RequestImportItem
+import search
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Items accepted per import call
+IMPORT_MAX_ITEMS = 10000
+
+# Rows per INSERT statement (PostgreSQL)
+IMPORT_BATCH_SIZE = 1000
+
+RawItems = List[Tuple[int, Any]]
+
+
+def _too_many_items() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"At most {IMPORT_MAX_ITEMS} requests per import"
+    )
+
+
+async def read_import_items(http_request: HTTPRequest) -> Tuple[RawItems, List[RequestImportError]]:
+    """
+    Parse the request body into (index, raw item) pairs
+
+    Returns the parsed items and the errors of NDJSON lines that are not valid JSON.
+
+    Raises:
+        HTTPException: If the body is not a JSON array or has too many items
+    """
+    items: RawItems = []
+    errors: List[RequestImportError] = []
+
+    if http_request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        def add_line(index: int, line: bytes):
+            if not line.strip():
+                return
+            if len(items) + len(errors) >= IMPORT_MAX_ITEMS:
+                raise _too_many_items()
+            try:
+                items.append((index, json.loads(line)))
+            except ValueError:
+                errors.append(RequestImportError(index=index, detail="Invalid JSON"))
+
+        # Parse line by line while the body is still arriving
+        index = 0
+        buffer = b""
+        async for chunk in http_request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                add_line(index, line)
+                index += 1
+        add_line(index, buffer)
+        return items, errors
+
+    try:
+        body = json.loads(await http_request.body())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON")
+    if not isinstance(body, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Expected a JSON array of requests or {NDJSON_MEDIA_TYPE}"
+        )
+    if len(body) > IMPORT_MAX_ITEMS:
+        raise _too_many_items()
+    return list(enumerate(body)), errors
+
+
+def _error_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc'])) or 'item'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def validate_import_items(raw_items: RawItems) -> Tuple[List[Tuple[int, RequestImportItem]], List[RequestImportError]]:
+    """Split raw items into valid RequestImportItem objects and per-item errors"""
+    valid = []
+    errors = []
+    for index, raw in raw_items:
+        try:
+            valid.append((index, RequestImportItem.model_validate(raw)))
+        except ValidationError as error:
+            errors.append(RequestImportError(index=index, detail=_error_detail(error)))
+    return valid, errors
+
+
+async def existing_user_ids(db: AsyncSession, user_ids: Iterable[int]) -> Set[int]:
+    """Which of the given user ids exist (one query)"""
+    result = await db.execute(select(User.id).where(User.id.in_(set(user_ids))))
+    return set(result.scalars().all())
+
+
+async def insert_requests(db: AsyncSession, items: List[RequestImportItem], deadline: datetime) -> List[int]:
+    """Insert NEW requests (client_id already resolved) and return their ids in input order"""
+    if not items:
+        return []
+
+    stmt = insert(Request).returning(Request.id, sort_by_parameter_order=True)
+    rows = [
+        dict(
+            client_id=item.client_id,
+            type=item.type,
+            description=item.description,
+            status=RequestStatus.NEW,
+            priority=item.priority,
+            deadline=deadline
+        )
+        for item in items
+    ]
+
+    if search.is_supported(db):
+        stmt = stmt.values(search_vector=search.description_vector(bindparam("search_text")))
+        for row in rows:
+            row["search_text"] = row["description"]
+        page_size = IMPORT_BATCH_SIZE
+    else:
+        # SQLite computes Request.version as max + 1, evaluated once per
+        # statement: a multi-row VALUES would give every row the same version
+        page_size = 1
+
+    result = await db.execute(stmt.execution_options(insertmanyvalues_page_size=page_size), rows)
+    return list(result.scalars().all())
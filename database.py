@@ -1,39 +1,162 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from config import settings
+import time
+from pathlib import Path
+from contextvars import ContextVar
+from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
-# Create database engine
+BASE_DIR = Path(__file__).resolve().parent
+
+# Alembic revision matching the schema create_all produced before migrations
+BASELINE_REVISION = "0001"
+
+
+def make_async_url(url: str) -> str:
+    """Convert a sync database URL to its async driver equivalent"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def make_dsn(url: str) -> str:
+    """Plain libpq DSN (no SQLAlchemy driver suffix) for direct asyncpg connections"""
+    scheme, rest = url.split("://", 1)
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+class PoolStats:
+    """Checkout wait-time counters of the API connection pool"""
+    
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def record(self, wait: float, timed_out: bool = False):
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+    
+    def stats(self, pool) -> dict:
+        return {
+            "size": pool.size(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return connection
+
+
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+# Create database engine (sync, used by scripts such as seed_data.py)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
     echo=False
 )
 
+# Create async database engine (used by the API)
+async_engine = create_async_engine(
+    make_async_url(settings.DATABASE_URL),
+    poolclass=TimedQueuePool,
+    echo=False,
+    **pool_options
+)
+
+# Per-request SQL statement counter, set by the query count middleware in main.py
+query_counter: ContextVar[Optional[list]] = ContextVar("query_counter", default=None)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def count_query(conn, cursor, statement, parameters, context, executemany):
+    """Count statements executed while a query counter is active"""
+    counter = query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency function to get database session.
+    Dependency function to get async database session.
     Used with FastAPI dependency injection.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def init_db():
-    """Initialize database - create all tables"""
-    Base.metadata.create_all(bind=engine)
+    """
+    Bring the database schema up to date (alembic upgrade head)
+
+    Databases created by create_all before migrations existed are stamped
+    with the baseline revision first.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    config.set_main_option("prepend_sys_path", str(BASE_DIR))
+    config.attributes["configure_logger"] = False
+
+    inspector = inspect(engine)
+    if inspector.has_table("users") and not inspector.has_table("alembic_version"):
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Automatic dispatch of NEW requests to executors
+
+A dispatch round loads the active executors with their skills (models.ExecutorSkill)
+and current load (the "executor" request counters, i.e. ASSIGNED + IN_PROGRESS
+requests) into an ExecutorLoadIndex, then hands out unassigned NEW requests,
+most urgent first (priority desc, deadline asc), each to the least-loaded
+executor handling its type. Executors at DISPATCH_MAX_LOAD get nothing more.
+
+Picking an executor is O(log n) in memory, so a round costs the same few
+statements for ten requests or ten thousand: two reads, one UPDATE, the
+counter upserts and one NOTIFY.
+
+With AUTO_DISPATCH enabled every worker runs a round each
+DISPATCH_INTERVAL_SECONDS; on PostgreSQL an advisory lock lets only one of
+them dispatch at a time, and the NEW requests are read with FOR UPDATE SKIP
+LOCKED so rows being changed by a handler are left for the next round.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, and_, cast, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from events import event_payload, request_events
+from models import ExecutorSkill, Request, RequestCounter, RequestStatus, RequestType, User, UserRole, UserStatus
+from stats import apply_counter_delta
+from transitions import ASSIGNABLE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key of the dispatch round
+DISPATCH_LOCK_ID = 7310021
+
+# Items accepted per POST /api/requests/assign-batch call
+ASSIGN_BATCH_MAX_ITEMS = 1000
+
+
+class ExecutorLoadIndex:
+    """
+    Least-loaded executor per request type
+
+    One min-heap of (load, executor_id) per type. Entries are never updated in
+    place: a load change pushes a fresh entry and stale ones are dropped when
+    they reach the top.
+    """
+
+    def __init__(self, max_load: int):
+        self.max_load = max_load
+        self._loads: Dict[int, int] = {}
+        self._skills: Dict[int, Tuple[RequestType, ...]] = {}
+        self._heaps: Dict[RequestType, list] = {request_type: [] for request_type in RequestType}
+
+    def __len__(self) -> int:
+        return len(self._loads)
+
+    def add(self, executor_id: int, skills: Iterable[RequestType], load: int):
+        """Register an executor; no skills means every request type"""
+        self._skills[executor_id] = tuple(skills) or tuple(RequestType)
+        self._set_load(executor_id, load)
+
+    def _set_load(self, executor_id: int, load: int):
+        self._loads[executor_id] = load
+        for request_type in self._skills[executor_id]:
+            heapq.heappush(self._heaps[request_type], (load, executor_id))
+
+    def pick(self, request_type: RequestType) -> Optional[int]:
+        """Least-loaded executor for request_type with room for one more request"""
+        heap = self._heaps[request_type]
+        while heap:
+            load, executor_id = heap[0]
+            if self._loads[executor_id] != load:
+                heapq.heappop(heap)
+                continue
+            return executor_id if load < self.max_load else None
+        return None
+
+    def assign(self, executor_id: int):
+        self._set_load(executor_id, self._loads[executor_id] + 1)
+
+
+async def load_executor_index(db: AsyncSession, max_load: int) -> ExecutorLoadIndex:
+    """Active executors with their skills and current load"""
+    load = func.coalesce(RequestCounter.count, 0)
+    result = await db.execute(
+        select(User.id, load.label("load"))
+        .outerjoin(RequestCounter, and_(
+            RequestCounter.dimension == "executor",
+            RequestCounter.key == cast(User.id, String)
+        ))
+        .where(User.role == UserRole.EXECUTOR, User.is_active.is_(True), User.status == UserStatus.CONFIRMED)
+    )
+    executors = result.all()
+
+    skills: Dict[int, List[RequestType]] = {}
+    result = await db.execute(select(ExecutorSkill.executor_id, ExecutorSkill.type))
+    for executor_id, request_type in result.all():
+        skills.setdefault(executor_id, []).append(request_type)
+
+    index = ExecutorLoadIndex(max_load)
+    for executor_id, executor_load in executors:
+        index.add(executor_id, skills.get(executor_id, ()), executor_load)
+    return index
+
+
+async def assign_executors(
+    db: AsyncSession,
+    assignments: List[Tuple[int, int]],
+    statuses: Tuple[RequestStatus, ...] = ASSIGNABLE_STATUSES
+) -> Dict[int, int]:
+    """
+    Set executor_id and status ASSIGNED on many requests
+
+    Takes (request_id, executor_id) pairs and returns the new version of each
+    request assigned; requests no longer in one of `statuses` are left as
+    they are and missing from the result. Counters, tombstones and
+    events are left to the caller. Used by dispatch rounds and by
+    POST /api/requests/assign-batch.
+    """
+    now = datetime.utcnow()
+    values = dict(status=RequestStatus.ASSIGNED, assigned_at=now)
+    assignable = Request.status.in_(statuses)
+
+    if db.bind.dialect.name == "postgresql":
+        # One UPDATE ... FROM unnest(ids, executor_ids): two array parameters for any batch size
+        pairs = func.unnest(
+            cast([request_id for request_id, _ in assignments], ARRAY(Integer)),
+            cast([executor_id for _, executor_id in assignments], ARRAY(Integer))
+        ).table_valued("request_id", "executor_id").render_derived(name="assignment")
+        result = await db.execute(
+            update(Request)
+            .where(Request.id == pairs.c.request_id, assignable)
+            .values(executor_id=pairs.c.executor_id, **values)
+            .returning(Request.id, Request.version)
+            .execution_options(synchronize_session=False)
+        )
+        return dict(result.all())
+
+    # SQLite evaluates the max + 1 version default once per statement: one row at a time
+    versions = {}
+    for request_id, executor_id in assignments:
+        result = await db.execute(
+            update(Request)
+            .where(Request.id == request_id, assignable)
+            .values(executor_id=executor_id, **values)
+            .returning(Request.version)
+            .execution_options(synchronize_session=False)
+        )
+        version = result.scalar()
+        if version is not None:
+            versions[request_id] = version
+    return versions
+
+
+async def dispatch_new_requests(db: AsyncSession, batch_size: int, max_load: int) -> List[Tuple[int, int]]:
+    """
+    Assign up to batch_size unassigned NEW requests within the caller's transaction
+
+    Returns (request_id, executor_id) pairs; the caller commits.
+    """
+    if db.bind.dialect.name == "postgresql":
+        if not await db.scalar(select(func.pg_try_advisory_xact_lock(DISPATCH_LOCK_ID))):
+            return []  # another worker is dispatching
+
+    index = await load_executor_index(db, max_load)
+    if not index:
+        return []
+
+    result = await db.execute(
+        select(Request.id, Request.client_id, Request.type)
+        .where(Request.status == RequestStatus.NEW, Request.executor_id.is_(None))
+        .order_by(Request.priority.desc(), Request.deadline.asc().nulls_last(), Request.created_at, Request.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+    assigned: List[Tuple[int, int, int]] = []
+    for row in result.all():
+        executor_id = index.pick(row.type)
+        if executor_id is None:
+            continue
+        index.assign(executor_id)
+        assigned.append((row.id, row.client_id, executor_id))
+
+    if not assigned:
+        return []
+    # Still NEW: SQLite ignores FOR UPDATE, a handler may have changed a request since the read
+    versions = await assign_executors(
+        db, [(request_id, executor_id) for request_id, _, executor_id in assigned], (RequestStatus.NEW,)
+    )
+    assigned = [assignment for assignment in assigned if assignment[0] in versions]
+    if not assigned:
+        return []
+
+    # request_counter_keys before and after: only status and executor change
+    delta = Counter(("executor", str(executor_id)) for _, _, executor_id in assigned)
+    delta[("status", RequestStatus.NEW.value)] -= len(assigned)
+    delta[("status", RequestStatus.ASSIGNED.value)] += len(assigned)
+    await apply_counter_delta(db, delta)
+    await request_events.emit_many(db, [
+        event_payload("request_assigned", request_id, client_id, executor_id, RequestStatus.ASSIGNED)
+        for request_id, client_id, executor_id in assigned
+    ])
+    return [(request_id, executor_id) for request_id, _, executor_id in assigned]
+
+
+class Dispatcher:
+    """Background task running dispatch rounds (AUTO_DISPATCH)"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.rounds = 0
+        self.assigned = 0
+        self.errors = 0
+        self.last_round_ms = 0.0
+
+    async def run_round(self, db: AsyncSession, batch_size: int, max_load: int) -> List[Tuple[int, int]]:
+        """One dispatch round, committed"""
+        started = time.perf_counter()
+        assignments = await dispatch_new_requests(db, batch_size, max_load)
+        await db.commit()
+        self.rounds += 1
+        self.assigned += len(assignments)
+        self.last_round_ms = round((time.perf_counter() - started) * 1000, 3)
+        return assignments
+
+    def start(self, session_factory, interval: float, batch_size: int, max_load: int):
+        async def loop():
+            while True:
+                try:
+                    async with session_factory() as db:
+                        assignments = await self.run_round(db, batch_size, max_load)
+                    # A full batch: more requests are waiting, go again right away
+                    if len(assignments) == batch_size:
+                        continue
+                except Exception:
+                    self.errors += 1
+                    logger.exception("Dispatch round failed")
+                await asyncio.sleep(interval)
+
+        self._task = asyncio.create_task(loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "rounds": self.rounds,
+            "assigned": self.assigned,
+            "errors": self.errors,
+            "last_round_ms": self.last_round_ms,
+        }
+
+
+dispatcher = Dispatcher()
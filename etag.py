@@ -0,0 +1,84 @@
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Request as HTTPRequest, Response, status
+
+
+class ETagStats:
+    """Conditional GET counters per endpoint"""
+
+    def __init__(self):
+        self._counters: Dict[str, list] = {}
+
+    def record(self, endpoint: str, conditional: bool, hit: bool):
+        counters = self._counters.setdefault(endpoint, [0, 0, 0])
+        counters[0] += 1
+        counters[1] += conditional
+        counters[2] += hit
+
+    def stats(self) -> dict:
+        return {
+            endpoint: {
+                "requests": total,
+                "conditional": conditional,
+                "not_modified": hits,
+                "hit_rate": round(hits / conditional, 4) if conditional else 0.0,
+            }
+            for endpoint, (total, conditional, hits) in self._counters.items()
+        }
+
+
+etag_stats = ETagStats()
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag of a response, derived from the row versions it is built from
+    (ids, Request.version, updated_at timestamps) instead of the serialized body
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def user_version(user) -> Optional[tuple]:
+    """
+    Version of a user row embedded in a response (None for a missing user)
+
+    Users have no version column; updated_at alone can repeat on SQLite
+    (one-second timestamps), so the profile fields are included as well.
+    """
+    if user is None:
+        return None
+    return (
+        (user.updated_at or user.created_at).isoformat(),
+        user.username, user.fullname, user.address, user.role.value, user.status.value, user.is_active
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(http_request: HTTPRequest, response: Response, endpoint: str, etag: str) -> Optional[Response]:
+    """
+    Tag the response and answer a matching If-None-Match with 304
+
+    Returns the 304 response to send instead of serializing the body,
+    or None if the client copy is stale.
+    """
+    response.headers["ETag"] = etag
+    # Browsers keep the copy but revalidate it on every request
+    response.headers["Cache-Control"] = "private, no-cache"
+
+    if_none_match = http_request.headers.get("if-none-match")
+    hit = etag_matches(if_none_match, etag)
+    etag_stats.record(endpoint, if_none_match is not None, hit)
+
+    if hit:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
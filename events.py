@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Real-time request events pushed over WebSocket (/ws/requests)
+
+Handlers call request_events.emit(db, ...) inside their transaction; the event
+is delivered only after the transaction commits. With REQUEST_EVENTS_NOTIFY
+enabled (PostgreSQL only) the event is sent with NOTIFY and every uvicorn
+worker, this one included, forwards it to its own subscribers. Otherwise it
+goes straight to the subscribers of this process.
+
+Subscribers see the same requests as GET /api/requests: clients their own,
+executors the ones assigned to them, managers and admins all of them.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Request, RequestStatus, UserRole
+from schemas import AuthenticatedUser
+
+NOTIFY_CHANNEL = "request_events"
+
+# Idle WebSocket connections get a "ping" event this often
+PING_INTERVAL_SECONDS = 30
+
+# Events not yet read by a slow subscriber; on overflow it gets a "resync" event
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# session.info key of events waiting for the commit (in-process delivery)
+_PENDING_KEY = "request_events"
+
+
+def event_payload(
+    name: str,
+    request_id: int,
+    client_id: int,
+    executor_id: Optional[int],
+    status: RequestStatus,
+    previous_executor_id: Optional[int] = None,
+    **extra: Any
+) -> Dict[str, Any]:
+    """Event about a request as sent to subscribers"""
+    payload = {
+        "event": name,
+        "request_id": request_id,
+        "client_id": client_id,
+        "executor_id": executor_id,
+        "status": status.value,
+        **extra,
+    }
+    if previous_executor_id is not None and previous_executor_id != executor_id:
+        payload["previous_executor_id"] = previous_executor_id
+    return payload
+
+
+class Subscription:
+    """Event queue of one WebSocket connection"""
+
+    def __init__(self, user: AuthenticatedUser):
+        self.user = user
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def can_see(self, payload: Dict[str, Any]) -> bool:
+        """Role scoping of get_requests applied to an event"""
+        if self.user.role == UserRole.CLIENT:
+            return payload["client_id"] == self.user.id
+        if self.user.role == UserRole.EXECUTOR:
+            return self.user.id in (payload["executor_id"], payload.get("previous_executor_id"))
+        return True
+
+    def put(self, payload: Dict[str, Any]) -> bool:
+        """Queue an event; returns False if the subscriber lagged and was reset"""
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            # The client missed events: drop the backlog and tell it to reload
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"event": "resync"})
+            return False
+
+
+class RequestEventBroker:
+    """In-process fan-out of request events with optional LISTEN/NOTIFY"""
+
+    def __init__(self):
+        self._subscriptions: Set[Subscription] = set()
+        self._listener = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user: AuthenticatedUser) -> Subscription:
+        subscription = Subscription(user)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def publish(self, payload: Dict[str, Any]):
+        """Deliver an event to the subscribers of this process"""
+        self.published += 1
+        for subscription in list(self._subscriptions):
+            if subscription.can_see(payload) and not subscription.put(payload):
+                self.dropped += 1
+
+    async def emit(
+        self,
+        db: AsyncSession,
+        name: str,
+        request: Request,
+        previous_executor_id: Optional[int] = None,
+        **extra: Any
+    ):
+        """
+        Queue an event about a request, delivered when db commits
+
+        Call after flush, so new requests already have an id.
+        """
+        await self._queue(db, [event_payload(
+            name, request.id, request.client_id, request.executor_id, request.status, previous_executor_id, **extra
+        )])
+
+    async def emit_many(self, db: AsyncSession, payloads: List[Dict[str, Any]]):
+        """Queue events built with event_payload() in one go (a single NOTIFY statement)"""
+        await self._queue(db, payloads)
+
+    async def emit_bulk(self, db: AsyncSession, name: str, **extra: Any):
+        """
+        Queue one event about many requests (e.g. an import), delivered when db commits
+
+        Carries no request: only managers and admins receive it.
+        """
+        await self._queue(db, [{"event": name, "request_id": None, "client_id": None, "executor_id": None, **extra}])
+
+    async def _queue(self, db: AsyncSession, payloads: List[Dict[str, Any]]):
+        if not payloads:
+            return
+        if self._listener is not None:
+            await db.execute(
+                text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+                {"channel": NOTIFY_CHANNEL, "payloads": [json.dumps(payload) for payload in payloads]}
+            )
+        else:
+            db.info.setdefault(_PENDING_KEY, []).extend(payloads)
+
+    async def start_listener(self, dsn: str):
+        """Forward events emitted by any worker via LISTEN/NOTIFY"""
+        import asyncpg
+
+        def on_notify(connection, pid, channel, payload):
+            self.publish(json.loads(payload))
+
+        self._listener = await asyncpg.connect(dsn)
+        await self._listener.add_listener(NOTIFY_CHANNEL, on_notify)
+
+    async def stop_listener(self):
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscriptions),
+            "published": self.published,
+            "dropped": self.dropped,
+            "notify": self._listener is not None,
+        }
+
+
+request_events = RequestEventBroker()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session):
+    for payload in session.info.pop(_PENDING_KEY, ()):
+        request_events.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,137 @@
+"""
+Streaming export of requests (GET /api/requests/export)
+
+Rows are read through a server-side cursor (yield_per) and written to the
+response one batch at a time, so memory stays flat however many requests
+match. Plain column rows are selected instead of ORM entities: nothing is
+kept in the session identity map while the export runs.
+
+CSV cells starting with =, +, -, @, tab or CR get a leading ' so that a
+description like =HYPERLINK(...) opens as text, not as a formula.
+"""
+
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from database import AsyncSessionLocal
+from models import Request, User
+
+# Rows fetched from the cursor and written to the response at a time
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, enum.Enum):
+    """Export file formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+_client = aliased(User, name="client")
+_executor = aliased(User, name="executor")
+
+EXPORT_COLUMNS = [
+    Request.id,
+    Request.created_at,
+    Request.type,
+    Request.status,
+    Request.priority,
+    Request.description,
+    Request.client_id,
+    _client.fullname.label("client_fullname"),
+    _client.username.label("client_username"),
+    _client.address.label("client_address"),
+    Request.executor_id,
+    _executor.fullname.label("executor_fullname"),
+    Request.assigned_at,
+    Request.started_at,
+    Request.completed_at,
+    Request.deadline,
+    Request.updated_at,
+]
+
+FIELD_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+
+def export_query():
+    """Requests with client and executor names, oldest first"""
+    return (
+        select(*EXPORT_COLUMNS)
+        .join(_client, Request.client_id == _client.id)
+        .outerjoin(_executor, Request.executor_id == _executor.id)
+        .order_by(Request.created_at, Request.id)
+    )
+
+
+def _plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+# Spreadsheets evaluate a cell starting with one of these as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value):
+    """Plain value, quoted with a leading ' if a spreadsheet would run it as a formula"""
+    value = _plain(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _encode_csv(rows: List, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        # BOM: Excel opens UTF-8 CSV with Cyrillic text correctly only with it
+        buffer.write("\ufeff")
+        writer.writerow(FIELD_NAMES)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: List, header: bool) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(FIELD_NAMES, map(_plain, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+_ENCODERS = {
+    ExportFormat.CSV: _encode_csv,
+    ExportFormat.NDJSON: _encode_ndjson,
+}
+
+
+async def stream_export(query, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Body of a StreamingResponse: one chunk per batch of EXPORT_BATCH_SIZE rows
+
+    Uses its own session, held only while the response is being sent,
+    rather than the request-scoped one from get_db.
+    """
+    encode = _ENCODERS[export_format]
+    header = True
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode(rows, header)
+            header = False
+    if header and export_format == ExportFormat.CSV:
+        # Nothing matched: still send the header row
+        yield encode([], header)
@@ -4,6 +4,8 @@ const TOKEN_KEY = 'auth_token';
 
 // API Helper Class
 class API {
+    eventsConnected = false;
+
     getToken() {
         return localStorage.getItem(TOKEN_KEY);
     }
@@ -108,6 +110,45 @@ class API {
         return this.request(`/api/requests${queryString ? '?' + queryString : ''}`);
     }
 
+    async getRequest(id) {
+        return this.request(`/api/requests/${id}`);
+    }
+
+    // Delta sync: pass next_since of the previous response (none for the first call)
+    async getRequestChanges(since = null, limit = 500) {
+        const params = new URLSearchParams({ limit });
+        if (since) params.set('since', since);
+        return this.request(`/api/requests/changes?${params}`);
+    }
+
+    // Current end of the changes feed: take it before getRequests(), then
+    // getRequestChanges(since) returns only what changed after that page loaded
+    async getRequestChangesPosition() {
+        const changes = await this.request('/api/requests/changes?position_only=true');
+        return changes.next_since;
+    }
+
+    // Saves GET /api/requests/export as a file (format: 'csv' or 'ndjson')
+    async exportRequests(format = 'csv', params = {}) {
+        const queryString = new URLSearchParams({ format, ...params }).toString();
+        const response = await fetch(`${API_BASE_URL}/api/requests/export?${queryString}`, {
+            headers: { 'Authorization': `Bearer ${this.getToken()}` }
+        });
+
+        if (!response.ok) {
+            const data = await response.json();
+            throw new Error(data.detail || 'Export failed');
+        }
+
+        const disposition = response.headers.get('Content-Disposition') || '';
+        const match = disposition.match(/filename="([^"]+)"/);
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(await response.blob());
+        link.download = match ? match[1] : `requests.${format}`;
+        link.click();
+        URL.revokeObjectURL(link.href);
+    }
+
     async createRequest(type, description) {
         return this.request('/api/requests', {
             method: 'POST',
@@ -129,11 +170,108 @@ class API {
         });
     }
 
+    // Hands out NEW requests to the least-loaded executors with a matching skill
+    async dispatchRequests() {
+        return this.request('/api/requests/dispatch', { method: 'POST' });
+    }
+
+    async getExecutorSkills(executorId) {
+        return this.request(`/api/users/${executorId}/skills`);
+    }
+
+    async updateExecutorSkills(executorId, types) {
+        return this.request(`/api/users/${executorId}/skills`, {
+            method: 'PUT',
+            body: JSON.stringify({ types })
+        });
+    }
+
     // Stats
     async getDashboardStats() {
         return this.request('/api/stats/dashboard');
     }
 
+    async getExecutorWorkload() {
+        return this.request('/api/executors/workload');
+    }
+
+    // Real-time events
+    // Calls onEvent(event) for every request event the user may see; reconnects
+    // automatically. this.eventsConnected tells pages whether pushes arrive.
+    subscribeRequestEvents(onEvent, reconnect = false) {
+        const token = this.getToken();
+        if (!token || !window.WebSocket) return;
+
+        const url = API_BASE_URL.replace(/^http/, 'ws') + `/ws/requests?token=${encodeURIComponent(token)}`;
+        const socket = new WebSocket(url);
+
+        socket.onopen = () => {
+            this.eventsConnected = true;
+            this.eventsRetryDelay = 1000;
+            // Events may have been missed while disconnected
+            if (reconnect) onEvent({ event: 'resync' });
+        };
+        socket.onmessage = (message) => {
+            const event = JSON.parse(message.data);
+            if (event.event !== 'ping') onEvent(event);
+        };
+        socket.onclose = () => {
+            this.eventsConnected = false;
+            const delay = this.eventsRetryDelay || 1000;
+            this.eventsRetryDelay = Math.min(delay * 2, 30000);
+            setTimeout(() => this.subscribeRequestEvents(onEvent, true), delay);
+        };
+    }
+
+    // Turns pushed events into in-place page updates. Returns an onEvent for
+    // subscribeRequestEvents: events arriving within `delay` ms are collected,
+    // then onRequests(requests, removedIds) gets the current state of each
+    // changed request (GET /api/requests/{id}) and the ids of requests that
+    // were deleted or are no longer visible. A resync, an event about many
+    // requests (an import) or more than maxRequests changes call onReload()
+    // instead.
+    requestEventBatcher({ onRequests, onReload, delay = 300, maxRequests = 20 }) {
+        let changed = new Set();
+        let removed = new Set();
+        let reload = false;
+        let timer = null;
+
+        const flush = async () => {
+            const ids = [...changed];
+            const removedIds = [...removed];
+            const fullReload = reload || ids.length > maxRequests;
+            changed = new Set();
+            removed = new Set();
+            reload = false;
+
+            if (fullReload) return onReload();
+            const requests = [];
+            await Promise.all(ids.map(async (id) => {
+                try {
+                    requests.push(await this.getRequest(id));
+                } catch (error) {
+                    removedIds.push(id);  // deleted or no longer visible to this user
+                }
+            }));
+            onRequests(requests, removedIds);
+        };
+
+        return (event) => {
+            if (event.event === 'comment_added') return;
+            if (event.request_id == null) {  // bulk events (requests_imported) carry request_id: null
+                reload = true;
+            } else if (event.event === 'request_deleted') {
+                changed.delete(event.request_id);
+                removed.add(event.request_id);
+            } else {
+                removed.delete(event.request_id);
+                changed.add(event.request_id);
+            }
+            clearTimeout(timer);
+            timer = setTimeout(flush, delay);
+        };
+    }
+
     // Settings
     async getSettings() {
         return this.request('/api/settings');
@@ -1,29 +1,58 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import sys
+import time
 sys.stdout.reconfigure(encoding='utf-8') if hasattr(sys.stdout, 'reconfigure') else None
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request as HTTPRequest, Response, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select, insert, update, delete, func, and_, or_, case, literal, true, tuple_, cast, String
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from database import get_db, init_db
-from models import User, Request, Comment, SystemSettings, UserRole, UserStatus, RequestStatus, RequestType
+from database import get_db, AsyncSessionLocal, async_engine, make_dsn, pool_stats, query_counter
+from models import (
+    User, Request, Comment, SystemSettings, RequestCounter, RequestTombstone, ExecutorSkill, UserRole, UserStatus, RequestStatus, RequestType,
+    TombstoneReason, ACTIVE_REQUEST_STATUSES, NO_DEADLINE, request_is_open, request_queue_key, snapshot_xmin
+)
 from schemas import (
-    UserCreate, UserInDB, UserPublic, UserUpdate, UserUpdateAdmin,
-    RequestCreate, RequestUpdate, RequestAssign, RequestInDB, RequestWithDetails,
+    UserCreate, UserInDB, UserPublic, UserUpdate, UserUpdateAdmin, ExecutorSkills, ExecutorSkillsUpdate,
+    RequestCreate, RequestUpdate, RequestAssign, RequestAssignBatchItem, RequestAssignBatchItemResult, RequestAssignBatchResult,
+    RequestInDB, RequestWithDetails, RequestChanges,
+    RequestImportError, RequestImportResult, DispatchAssignment, DispatchResult,
     CommentCreate, CommentInDB, CommentWithUser,
-    LoginRequest, Token,
+    LoginRequest, Token, AuthenticatedUser,
     SystemSettingUpdate, SystemSettingInDB,
-    DashboardStats
+    DashboardStats, ExecutorLoad, ExecutorWorkload
 )
 from auth import (
-    authenticate_user, create_access_token, get_password_hash,
+    authenticate_user, authenticate_token, create_access_token, get_password_hash_async, password_hash_pool, user_cache,
     get_current_active_user, require_admin, require_manager, require_executor
 )
 from config import settings
+from pagination import (
+    NEXT_CURSOR_HEADER, RequestOrder, cursor_position, decode_changes_cursor, decode_queue_cursor,
+    encode_changes_cursor, next_cursor
+)
+from etag import etag_stats, make_etag, not_modified, user_version
+from serialization import json_response
+from export import MEDIA_TYPES, ExportFormat, export_query, stream_export
+from bulk_import import existing_user_ids, insert_requests, read_import_items, validate_import_items
+from system_settings import system_settings_cache
+import search
+from events import PING_INTERVAL_SECONDS, event_payload, request_events
+from transitions import ASSIGNABLE_STATUSES, check_transition, previous_statuses, transition_conflict
+from dispatch import ASSIGN_BATCH_MAX_ITEMS, assign_executors, dispatcher
+from sla import sla_monitor
+from stats import (
+    request_counter_keys, counter_delta, apply_counter_delta,
+    rebuild_request_counters, request_counters_empty
+)
 
 # Create FastAPI app
 app = FastAPI(
@@ -46,24 +75,138 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "X-Query-Count", "ETag", "Content-Disposition"],
+)
+
+# Compress larger responses (request lists with long descriptions)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
 )
 
 
+async def count_queries(request: HTTPRequest, call_next):
+    """Report the number of SQL statements per request (debug only)"""
+    counter = [0]
+    token = query_counter.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        query_counter.reset(token)
+    response.headers["X-Query-Count"] = str(counter[0])
+    return response
+
+
+# Registered only when enabled: an HTTP middleware costs every request an extra task
+if settings.QUERY_COUNT_HEADER:
+    app.middleware("http")(count_queries)
+
+
+# Eager loading for responses with nested users.
+# Many-to-one, so a JOIN keeps every list endpoint at a single SELECT.
+REQUEST_DETAILS_OPTIONS = (joinedload(Request.client), joinedload(Request.executor))
+COMMENT_USER_OPTIONS = (joinedload(Comment.user),)
+
+
+def scope_requests(query, current_user: AuthenticatedUser):
+    """Restrict a request query to the requests the current user may see"""
+    # Clients see only their own requests
+    if current_user.role == UserRole.CLIENT:
+        query = query.where(Request.client_id == current_user.id)
+    
+    # Executors see assigned requests
+    elif current_user.role == UserRole.EXECUTOR:
+        query = query.where(Request.executor_id == current_user.id)
+    
+    # Managers and admins see all requests
+    return query
+
+
+def scope_tombstones(query, current_user: AuthenticatedUser):
+    """Restrict a tombstone query to requests that left the current user's view"""
+    if current_user.role == UserRole.CLIENT:
+        return query.where(
+            RequestTombstone.client_id == current_user.id,
+            RequestTombstone.reason == TombstoneReason.DELETED
+        )
+    
+    # Executors also lose requests reassigned to someone else
+    if current_user.role == UserRole.EXECUTOR:
+        return query.where(RequestTombstone.executor_id == current_user.id)
+    
+    return query.where(RequestTombstone.reason == TombstoneReason.DELETED)
+
+
+def request_list_etag(requests) -> str:
+    """ETag of RequestWithDetails rows: request versions and nested users"""
+    return make_etag([
+        (request.id, request.version, user_version(request.client), user_version(request.executor))
+        for request in requests
+    ])
+
+
+def filter_requests(query, status_filter: Optional[RequestStatus], type_filter: Optional[RequestType]):
+    """Apply the optional status/type filters of the request list endpoints"""
+    if status_filter:
+        query = query.where(Request.status == status_filter)
+    
+    if type_filter:
+        query = query.where(Request.type == type_filter)
+    
+    return query
+
+
+def request_list_query(
+    current_user: AuthenticatedUser,
+    status_filter: Optional[RequestStatus] = None,
+    type_filter: Optional[RequestType] = None,
+    cursor: Optional[str] = None,
+    order: RequestOrder = RequestOrder.CREATED
+):
+    """
+    Statement behind GET /api/requests, in keyset order
+
+    Served by the ix_requests_*_created_at indexes, and by ix_requests_open_queue
+    for the priority queue (checked by test_query_plans.py).
+    """
+    query = scope_requests(select(Request).options(*REQUEST_DETAILS_OPTIONS), current_user)
+    query = filter_requests(query, status_filter, type_filter)
+    
+    if order == RequestOrder.PRIORITY:
+        query = query.where(request_is_open())
+        if cursor:
+            priority, deadline, row_id = decode_queue_cursor(cursor)
+            query = query.where(
+                tuple_(*request_queue_key()) > tuple_(-priority, deadline or NO_DEADLINE, row_id)
+            )
+        return query.order_by(*request_queue_key())
+    
+    # Keyset pagination
+    if cursor:
+        query = query.where(tuple_(Request.created_at, Request.id) < tuple_(*cursor_position(cursor)))
+    
+    return query.order_by(Request.created_at.desc(), Request.id.desc())
+
+
 # ==================== Initialization ====================
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    init_db()
+    """
+    Create default data on startup
     
+    The schema is managed by alembic: run.bat / start_backend.bat call
+    database.init_db() before starting, which also stamps pre-migration databases.
+    """
     # Create default admin user if not exists
-    db = next(get_db())
-    try:
-        admin = db.query(User).filter(User.username == "1488").first()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.username == "1488"))
+        admin = result.scalars().first()
         if not admin:
             admin = User(
                 username="1488",
-                hashed_password=get_password_hash("0000"),
+                hashed_password=await get_password_hash_async("0000"),
                 fullname="Администратор Системы",
                 address="Главный офис",
                 role=UserRole.ADMIN,
@@ -71,11 +214,12 @@ async def startup_event():
                 is_active=True
             )
             db.add(admin)
-            db.commit()
+            await db.commit()
             print("✓ Default admin user created (username: 1488, password: 0000)")
         
         # Create default system settings
-        setting = db.query(SystemSettings).filter(SystemSettings.key == "response_time_hours").first()
+        result = await db.execute(select(SystemSettings).where(SystemSettings.key == "response_time_hours"))
+        setting = result.scalars().first()
         if not setting:
             setting = SystemSettings(
                 key="response_time_hours",
@@ -83,10 +227,43 @@ async def startup_event():
                 description="Время ответа на заявку (часы)"
             )
             db.add(setting)
-            db.commit()
+            await db.commit()
             print("✓ Default system settings created")
-    finally:
-        db.close()
+        
+        await system_settings_cache.load(db)
+        
+        # Build statistics counters for databases created before they existed
+        if await db.run_sync(request_counters_empty):
+            await db.run_sync(rebuild_request_counters)
+            await db.commit()
+            print("✓ Statistics counters rebuilt")
+    
+    if settings.SETTINGS_NOTIFY and async_engine.dialect.name == "postgresql":
+        await system_settings_cache.start_listener(make_dsn(settings.DATABASE_URL), AsyncSessionLocal)
+    
+    if settings.REQUEST_EVENTS_NOTIFY and async_engine.dialect.name == "postgresql":
+        await request_events.start_listener(make_dsn(settings.DATABASE_URL))
+    
+    if settings.AUTO_DISPATCH:
+        dispatcher.start(
+            AsyncSessionLocal, settings.DISPATCH_INTERVAL_SECONDS, settings.DISPATCH_BATCH_SIZE, settings.DISPATCH_MAX_LOAD
+        )
+    
+    if settings.SLA_MONITOR:
+        sla_monitor.start(
+            AsyncSessionLocal, settings.SLA_CHECK_INTERVAL_SECONDS, settings.SLA_WARNING_HOURS, settings.SLA_BATCH_SIZE
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background resources on shutdown"""
+    password_hash_pool.shutdown()
+    await dispatcher.stop()
+    await sla_monitor.stop()
+    await system_settings_cache.stop_listener()
+    await request_events.stop_listener()
+    await async_engine.dispose()
 
 
 # ==================== Health Check ====================
@@ -104,12 +281,13 @@ async def root():
 # ==================== Authentication ====================
 
 @app.post("/api/auth/register", response_model=UserInDB, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user (client)
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    result = await db.execute(select(User).where(User.username == user_data.username))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -119,7 +297,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     # Create new user
     new_user = User(
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         fullname=user_data.fullname,
         address=user_data.address,
         role=UserRole.CLIENT,
@@ -128,18 +306,18 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @app.post("/api/auth/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_db)):
     """
     Login and get JWT token
     """
-    user = authenticate_user(db, login_data.username, login_data.password)
+    user = await authenticate_user(db, login_data.username, login_data.password)
     
     if not user:
         raise HTTPException(
@@ -157,56 +335,103 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @app.get("/api/auth/me", response_model=UserInDB)
-async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get current user information
     """
-    return current_user
+    result = await db.execute(select(User).where(User.id == current_user.id))
+    user = result.scalars().first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return user
 
 
 # ==================== Users ====================
 
 @app.get("/api/users", response_model=List[UserInDB])
 async def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     role: Optional[UserRole] = None,
     status: Optional[UserStatus] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(require_manager),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get list of users (managers and admins only)
+    
+    Pass the X-Next-Cursor header of the previous page as `cursor`
+    to page by (created_at, id) instead of `skip`. With `search` the
+    results are ranked by relevance and paged with `skip`.
     """
-    query = db.query(User)
+    query = select(User)
     
     # Filter by role
     if role:
-        query = query.filter(User.role == role)
+        query = query.where(User.role == role)
     
     # Filter by status
     if status:
-        query = query.filter(User.status == status)
+        query = query.where(User.status == status)
     
     # Search by username or fullname
     if search:
-        query = query.filter(
+        # ILIKE rather than icontains(): lower(column) LIKE cannot use the
+        # pg_trgm indexes on the plain columns
+        pattern = "%" + search.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        query = query.where(
             or_(
-                User.username.ilike(f"%{search}%"),
-                User.fullname.ilike(f"%{search}%")
+                User.username.ilike(pattern, escape="/"),
+                User.fullname.ilike(pattern, escape="/")
             )
         )
+        
+        if db.bind.dialect.name == "postgresql":
+            # Matches come from the pg_trgm GIN indexes, ranked by trigram similarity
+            rank = func.greatest(func.similarity(User.username, search), func.similarity(User.fullname, search))
+        else:
+            # Fallback (SQLite): prefix matches first
+            rank = case(
+                (User.username.istartswith(search, autoescape=True), 1),
+                (User.fullname.istartswith(search, autoescape=True), 1),
+                else_=0
+            )
+        query = query.order_by(rank.desc(), User.id.desc())
+    
+    else:
+        # Keyset pagination
+        if cursor:
+            query = query.where(tuple_(User.created_at, User.id) < tuple_(*cursor_position(cursor)))
+        
+        query = query.order_by(User.created_at.desc(), User.id.desc())
+    
+    result = await db.execute(query.offset(skip).limit(limit))
+    users = result.scalars().all()
+    
+    cursor_value = next_cursor(users, limit) if not search else None
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
     
-    users = query.offset(skip).limit(limit).all()
-    return users
+    return json_response(List[UserInDB], users, response)
 
 
 @app.get("/api/users/{user_id}", response_model=UserInDB)
 async def get_user(
     user_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    http_request: HTTPRequest,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get user by ID
@@ -218,13 +443,18 @@ async def get_user(
             detail="Not authorized to view this user"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
+    cached = not_modified(http_request, response, "get_user", make_etag(user.id, user_version(user)))
+    if cached:
+        return cached
+    
     return user
 
 
@@ -232,8 +462,8 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update user information
@@ -245,7 +475,8 @@ async def update_user(
             detail="Not authorized to update this user"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -258,10 +489,10 @@ async def update_user(
     if user_update.address:
         user.address = user_update.address
     if user_update.password:
-        user.hashed_password = get_password_hash(user_update.password)
+        user.hashed_password = await get_password_hash_async(user_update.password)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
@@ -270,13 +501,14 @@ async def update_user(
 async def update_user_admin(
     user_id: int,
     user_update: UserUpdateAdmin,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update user information (admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -289,7 +521,7 @@ async def update_user_admin(
     if user_update.address:
         user.address = user_update.address
     if user_update.password:
-        user.hashed_password = get_password_hash(user_update.password)
+        user.hashed_password = await get_password_hash_async(user_update.password)
     if user_update.role:
         user.role = user_update.role
     if user_update.status:
@@ -297,30 +529,82 @@ async def update_user_admin(
     if user_update.is_active is not None:
         user.is_active = user_update.is_active
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.id)
     
     return user
 
 
+@app.get("/api/users/{user_id}/skills", response_model=ExecutorSkills)
+async def get_executor_skills(
+    user_id: int,
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Request types an executor handles in automatic dispatch (managers and admins only)
+    """
+    result = await db.execute(select(ExecutorSkill.type).where(ExecutorSkill.executor_id == user_id))
+    return ExecutorSkills(executor_id=user_id, types=result.scalars().all())
+
+
+@app.put("/api/users/{user_id}/skills", response_model=ExecutorSkills)
+async def update_executor_skills(
+    user_id: int,
+    skills_update: ExecutorSkillsUpdate,
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Replace the request types an executor handles; an empty list means any type
+    """
+    result = await db.execute(select(User.role).where(User.id == user_id))
+    role = result.scalar()
+    if role is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    if role != UserRole.EXECUTOR:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User is not an executor"
+        )
+    
+    types = list(dict.fromkeys(skills_update.types))
+    await db.execute(delete(ExecutorSkill).where(ExecutorSkill.executor_id == user_id))
+    db.add_all(ExecutorSkill(executor_id=user_id, type=request_type) for request_type in types)
+    await db.commit()
+    
+    return ExecutorSkills(executor_id=user_id, types=types)
+
+
 @app.delete("/api/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete user (admin only)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(
+        select(User)
+        .options(selectinload(User.requests), selectinload(User.assigned_requests))
+        .where(User.id == user_id)
+    )
+    user = result.scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    user_cache.invalidate(user_id)
     
     return None
 
@@ -329,49 +613,210 @@ async def delete_user(
 
 @app.get("/api/requests", response_model=List[RequestWithDetails])
 async def get_requests(
+    http_request: HTTPRequest,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status_filter: Optional[RequestStatus] = None,
     type_filter: Optional[RequestType] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    order: RequestOrder = RequestOrder.CREATED,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get list of requests
+    
+    Pass the X-Next-Cursor header of the previous page as `cursor`
+    to page by (created_at, id) instead of `skip`.
+    
+    order=priority is the "what's next" queue: open requests only, most
+    urgent first (priority desc, then earliest deadline); its cursors page
+    by (priority, deadline, id).
     """
-    query = db.query(Request)
+    query = request_list_query(current_user, status_filter, type_filter, cursor, order)
+    result = await db.execute(query.offset(skip).limit(limit))
+    requests = result.scalars().all()
     
-    # Clients see only their own requests
-    if current_user.role == UserRole.CLIENT:
-        query = query.filter(Request.client_id == current_user.id)
+    cursor_value = next_cursor(requests, limit, order)
+    if cursor_value:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_value
     
-    # Executors see assigned requests
-    elif current_user.role == UserRole.EXECUTOR:
-        query = query.filter(Request.executor_id == current_user.id)
+    cached = not_modified(http_request, response, "get_requests", request_list_etag(requests))
+    if cached:
+        return cached
     
-    # Managers and admins see all requests
+    return json_response(List[RequestWithDetails], requests, response)
+
+
+@app.get("/api/requests/changes", response_model=RequestChanges)
+async def get_request_changes(
+    response: Response,
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
+    position_only: bool = False,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Requests changed since the `since` position and ids of requests that left the user's view
     
-    # Apply filters
-    if status_filter:
-        query = query.filter(Request.status == status_filter)
+    Omit `since` for the first call (the full list), then pass `next_since`
+    of the previous response; poll again right away while `has_more` is true.
     
-    if type_filter:
-        query = query.filter(Request.type == type_filter)
+    position_only=true returns no rows, only the current end of the feed as
+    `next_since`: take it before loading a page with GET /api/requests, then
+    poll from it for the changes to that page.
+    
+    Changes come in (writing transaction, version) order. On PostgreSQL,
+    versions written by transactions newer than the oldest one still running
+    are held back until it finishes: a transaction that took its version
+    earlier but commits later is then still delivered.
+    """
+    position = decode_changes_cursor(since) if since else (0, 0)
+    xmin = None
+    if db.bind.dialect.name == "postgresql":
+        xmin = await db.scalar(select(snapshot_xmin()))
+    
+    if position_only:
+        if xmin is not None:
+            # Writers below xmin have finished; later ones may be resent, never lost
+            latest = (xmin, 0)
+        else:
+            # Single writer: versions become visible in order
+            versions = [
+                await db.scalar(select(func.max(Request.version))),
+                await db.scalar(select(func.max(RequestTombstone.version)))
+            ]
+            latest = (0, max((version for version in versions if version is not None), default=0))
+        changes = RequestChanges(changed=[], deleted=[], next_since=encode_changes_cursor(*latest), has_more=False)
+        return json_response(RequestChanges, changes, response)
+    
+    def feed_page(query, model):
+        query = query.where(tuple_(model.version_xid, model.version) > tuple_(*position))
+        if xmin is not None:
+            query = query.where(model.version_xid < xmin)
+        return query.order_by(model.version_xid, model.version).limit(limit)
+    
+    result = await db.execute(
+        feed_page(scope_requests(select(Request).options(*REQUEST_DETAILS_OPTIONS), current_user), Request)
+    )
+    changed = result.scalars().all()
+    
+    result = await db.execute(feed_page(
+        scope_tombstones(
+            select(RequestTombstone.request_id, RequestTombstone.version_xid, RequestTombstone.version), current_user
+        ),
+        RequestTombstone
+    ))
+    tombstones = result.all()
+    
+    def row_position(row):
+        return row.version_xid, row.version
+    
+    # A full page from either source: stop both at the lower of their last positions
+    full_pages = [row_position(rows[-1]) for rows in (changed, tombstones) if len(rows) == limit]
+    has_more = bool(full_pages)
+    if has_more:
+        cutoff = min(full_pages)
+        changed = [row for row in changed if row_position(row) <= cutoff]
+        tombstones = [row for row in tombstones if row_position(row) <= cutoff]
+    
+    next_position = max(map(row_position, [*changed, *tombstones]), default=position)
+    if xmin is not None and not has_more:
+        # Every writer below xmin has been read: resume from there
+        next_position = max(next_position, (xmin, 0))
+    
+    # A request visible again (e.g. reassigned back) is not removed
+    changed_ids = {row.id for row in changed}
+    deleted = list(dict.fromkeys(row.request_id for row in tombstones if row.request_id not in changed_ids))
+    
+    changes = RequestChanges(
+        changed=changed,
+        deleted=deleted,
+        next_since=encode_changes_cursor(*next_position),
+        has_more=has_more
+    )
+    return json_response(RequestChanges, changes, response)
+
+
+@app.get("/api/requests/export")
+async def export_requests(
+    format: ExportFormat = ExportFormat.CSV,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status_filter: Optional[RequestStatus] = None,
+    type_filter: Optional[RequestType] = None,
+    executor_id: Optional[int] = None,
+    current_user: AuthenticatedUser = Depends(require_manager)
+):
+    """
+    Export requests as CSV or NDJSON (one JSON object per line), oldest first
+    
+    `date_from` (inclusive) and `date_to` (exclusive) filter by creation time.
+    The file is streamed while it is read from the database.
+    """
+    query = filter_requests(export_query(), status_filter, type_filter)
+    if date_from:
+        query = query.where(Request.created_at >= date_from)
+    if date_to:
+        query = query.where(Request.created_at < date_to)
+    if executor_id is not None:
+        query = query.where(Request.executor_id == executor_id)
+    
+    filename = f"requests_{datetime.utcnow():%Y%m%d_%H%M%S}.{format.value}"
+    return StreamingResponse(
+        stream_export(query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@app.get("/api/requests/search", response_model=List[RequestWithDetails])
+async def search_requests(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    skip: int = 0,
+    limit: int = 20,
+    status_filter: Optional[RequestStatus] = None,
+    type_filter: Optional[RequestType] = None,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over request descriptions and comments, best matches first
+    """
+    query = scope_requests(select(Request).options(*REQUEST_DETAILS_OPTIONS), current_user)
+    query = filter_requests(query, status_filter, type_filter)
+    
+    if search.is_supported(db):
+        ts_query = search.search_query(q)
+        query = query.where(Request.search_vector.op("@@")(ts_query)).order_by(
+            func.ts_rank_cd(Request.search_vector, ts_query).desc(), Request.id.desc()
+        )
+    else:
+        # Fallback (SQLite): substring match on the description
+        query = query.where(Request.description.icontains(q, autoescape=True)).order_by(Request.id.desc())
     
-    requests = query.order_by(Request.created_at.desc()).offset(skip).limit(limit).all()
-    return requests
+    result = await db.execute(query.offset(skip).limit(limit))
+    return json_response(List[RequestWithDetails], result.scalars().all(), response)
 
 
 @app.get("/api/requests/{request_id}", response_model=RequestWithDetails)
 async def get_request(
     request_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    http_request: HTTPRequest,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get request by ID
     """
-    request = db.query(Request).filter(Request.id == request_id).first()
+    result = await db.execute(
+        select(Request).options(*REQUEST_DETAILS_OPTIONS).where(Request.id == request_id)
+    )
+    request = result.scalars().first()
     if not request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -391,24 +836,24 @@ async def get_request(
             detail="Not authorized to view this request"
         )
     
+    cached = not_modified(http_request, response, "get_request", request_list_etag([request]))
+    if cached:
+        return cached
+    
     return request
 
 
 @app.post("/api/requests", response_model=RequestInDB, status_code=status.HTTP_201_CREATED)
 async def create_request(
     request_data: RequestCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new request
     """
     # Get response time setting
-    response_time_setting = db.query(SystemSettings).filter(
-        SystemSettings.key == "response_time_hours"
-    ).first()
-    
-    response_hours = int(response_time_setting.value) if response_time_setting else 24
+    response_hours = system_settings_cache.get("response_time_hours")
     deadline = datetime.utcnow() + timedelta(hours=response_hours)
     
     new_request = Request(
@@ -419,60 +864,337 @@ async def create_request(
         priority=1,
         deadline=deadline
     )
+    if search.is_supported(db):
+        new_request.search_vector = search.description_vector(request_data.description)
     
     db.add(new_request)
-    db.commit()
-    db.refresh(new_request)
+    await db.flush()
+    await apply_counter_delta(db, counter_delta([], request_counter_keys(new_request)))
+    await request_events.emit(db, "request_created", new_request)
+    await db.commit()
+    await db.refresh(new_request)
     
     return new_request
 
 
-@app.put("/api/requests/{request_id}", response_model=RequestInDB)
-async def update_request(
-    request_id: int,
-    request_update: RequestUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+@app.post("/api/requests/import", response_model=RequestImportResult)
+async def import_requests(
+    http_request: HTTPRequest,
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Update request
+    Create many requests in one transaction (e.g. from the legacy call center)
+    
+    Body: a JSON array of RequestImportItem objects, or one object per line
+    with Content-Type application/x-ndjson. Invalid items are skipped and
+    reported by their position in the input; the valid ones are imported together.
     """
-    request = db.query(Request).filter(Request.id == request_id).first()
-    if not request:
+    started = time.perf_counter()
+    raw_items, errors = await read_import_items(http_request)
+    valid, validation_errors = validate_import_items(raw_items)
+    errors.extend(validation_errors)
+    
+    for _, item in valid:
+        if item.client_id is None:
+            item.client_id = current_user.id
+    
+    known_clients = await existing_user_ids(db, (item.client_id for _, item in valid))
+    items = []
+    for index, item in valid:
+        if item.client_id in known_clients:
+            items.append(item)
+        else:
+            errors.append(RequestImportError(index=index, detail="Client not found"))
+    
+    response_hours = system_settings_cache.get("response_time_hours")
+    deadline = datetime.utcnow() + timedelta(hours=response_hours)
+    ids = await insert_requests(db, items, deadline)
+    
+    delta = Counter()
+    for item in items:
+        delta.update(request_counter_keys(Request(type=item.type, status=RequestStatus.NEW)))
+    await apply_counter_delta(db, delta)
+    if ids:
+        await request_events.emit_bulk(db, "requests_imported", count=len(ids))
+    await db.commit()
+    
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda error: error.index)
+    return RequestImportResult(
+        imported=len(ids),
+        failed=len(errors),
+        ids=ids,
+        errors=errors,
+        elapsed_ms=round(elapsed * 1000, 3),
+        rows_per_second=round(len(ids) / elapsed, 1) if elapsed else 0.0
+    )
+
+
+@app.post("/api/requests/dispatch", response_model=DispatchResult)
+async def dispatch_requests(
+    limit: int = Query(settings.DISPATCH_BATCH_SIZE, ge=1, le=10000),
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Assign unassigned NEW requests now, most urgent first, each to the
+    least-loaded executor handling its type (managers and admins only)
+    
+    Runs the same round as the AUTO_DISPATCH background task.
+    """
+    started = time.perf_counter()
+    assignments = await dispatcher.run_round(db, limit, settings.DISPATCH_MAX_LOAD)
+    elapsed = time.perf_counter() - started
+    
+    return DispatchResult(
+        assigned=len(assignments),
+        assignments=[
+            DispatchAssignment(request_id=request_id, executor_id=executor_id)
+            for request_id, executor_id in assignments
+        ],
+        elapsed_ms=round(elapsed * 1000, 3),
+        requests_per_second=round(len(assignments) / elapsed, 1) if elapsed else 0.0
+    )
+
+
+@app.post("/api/requests/assign-batch", response_model=RequestAssignBatchResult)
+async def assign_requests_batch(
+    items: List[RequestAssignBatchItem],
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Assign executors to many requests in one transaction (managers and admins only)
+    
+    Executors and requests are each looked up with one query and the valid
+    items are updated with a single statement. Invalid items (unknown or
+    closed requests, non-executors) are skipped and reported in the per-item
+    results; the valid ones are assigned together.
+    """
+    if len(items) > ASSIGN_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {ASSIGN_BATCH_MAX_ITEMS} assignments per batch"
+        )
+    
+    started = time.perf_counter()
+    result = await db.execute(
+        select(User.id, User.role).where(User.id.in_({item.executor_id for item in items}))
+    )
+    executor_roles = dict(result.all())
+    
+    result = await db.execute(
+        select(Request.id, Request.client_id, Request.executor_id, Request.status, Request.type, Request.created_at)
+        .where(Request.id.in_({item.request_id for item in items}))
+        .order_by(Request.id)
+        .with_for_update()
+    )
+    requests = {row.id: row for row in result.all()}
+    
+    details = {}
+    seen = set()
+    valid = []
+    for index, item in enumerate(items):
+        if item.request_id not in requests:
+            details[index] = "Request not found"
+        elif item.request_id in seen:
+            details[index] = "Duplicate request_id"
+        elif requests[item.request_id].status not in ASSIGNABLE_STATUSES:
+            details[index] = "Request is closed"
+        elif item.executor_id not in executor_roles:
+            details[index] = "Executor not found"
+        elif executor_roles[item.executor_id] != UserRole.EXECUTOR:
+            details[index] = "User is not an executor"
+        else:
+            valid.append((index, item))
+        seen.add(item.request_id)
+    
+    versions = {}
+    if valid:
+        # Conditional on ASSIGNABLE_STATUSES as well: SQLite ignores FOR UPDATE
+        versions = await assign_executors(db, [(item.request_id, item.executor_id) for _, item in valid])
+        
+        delta = Counter()
+        tombstones = []
+        payloads = []
+        for index, item in valid:
+            if item.request_id not in versions:
+                details[index] = "Request is closed"
+                continue
+            row = requests[item.request_id]
+            before = Request(status=row.status, type=row.type, created_at=row.created_at, executor_id=row.executor_id)
+            after = Request(status=RequestStatus.ASSIGNED, type=row.type, created_at=row.created_at, executor_id=item.executor_id)
+            delta.update(counter_delta(request_counter_keys(before), request_counter_keys(after)))
+            if row.executor_id is not None and row.executor_id != item.executor_id:
+                tombstones.append(dict(
+                    request_id=row.id, executor_id=row.executor_id, reason=TombstoneReason.UNASSIGNED
+                ))
+            payloads.append(event_payload(
+                "request_assigned", row.id, row.client_id, item.executor_id, RequestStatus.ASSIGNED, row.executor_id
+            ))
+        
+        await apply_counter_delta(db, delta)
+        if tombstones:
+            # executemany without RETURNING: one statement per row on SQLite,
+            # so each tombstone gets its own version
+            await db.execute(insert(RequestTombstone), tombstones)
+        await request_events.emit_many(db, payloads)
+        await db.commit()
+    
+    results = [
+        RequestAssignBatchItemResult(
+            request_id=item.request_id,
+            executor_id=item.executor_id,
+            assigned=index not in details,
+            detail=details.get(index),
+            version=versions.get(item.request_id) if index not in details else None
+        )
+        for index, item in enumerate(items)
+    ]
+    return RequestAssignBatchResult(
+        assigned=len(items) - len(details),
+        failed=len(details),
+        results=results,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+
+
+async def updatable_request(db: AsyncSession, request_id: int, current_user: AuthenticatedUser, is_manager: bool):
+    """
+    Status and version of a request the current user may update
+    
+    Raises:
+        HTTPException: If the request does not exist or belongs to someone else
+    """
+    result = await db.execute(
+        select(Request.status, Request.version, Request.client_id, Request.executor_id)
+        .where(Request.id == request_id)
+    )
+    current = result.first()
+    if current is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Request not found"
         )
+    if not (is_manager or current_user.id in (current.client_id, current.executor_id)):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this request"
+        )
+    return current
+
+
+@app.put("/api/requests/{request_id}", response_model=RequestInDB)
+async def update_request(
+    request_id: int,
+    request_update: RequestUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update request
     
-    # Check permissions
-    is_owner = request.client_id == current_user.id
-    is_executor = request.executor_id == current_user.id
+    Status changes follow REQUEST_TRANSITIONS (see transitions.py). The update
+    is a single conditional UPDATE ... RETURNING: the request must still be in
+    `expected_status` (by default the one status the new status can follow)
+    and, if given, at `version`; otherwise the response is 409 and nothing is
+    overwritten.
+    """
     is_manager = current_user.role in [UserRole.ADMIN, UserRole.MANAGER]
+    target_status = request_update.status
+    expected_status = request_update.expected_status
     
-    if not (is_owner or is_executor or is_manager):
+    if target_status == RequestStatus.ASSIGNED:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this request"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use POST /api/requests/{request_id}/assign to assign an executor"
         )
     
-    # Update fields
-    if request_update.description and is_owner:
-        request.description = request_update.description
+    current = None
+    if target_status and expected_status is None:
+        sources = previous_statuses(target_status)
+        if len(sources) == 1:
+            expected_status = sources[0]
+        else:
+            # Cancelling: find out which of the open statuses the request is in
+            current = await updatable_request(db, request_id, current_user, is_manager)
+            expected_status = current.status
+    if target_status:
+        check_transition(expected_status, target_status)
     
-    if request_update.status:
-        request.status = request_update.status
-        
-        if request_update.status == RequestStatus.IN_PROGRESS and not request.started_at:
-            request.started_at = datetime.utcnow()
-        
-        if request_update.status == RequestStatus.COMPLETED and not request.completed_at:
-            request.completed_at = datetime.utcnow()
+    conditions = [Request.id == request_id]
+    if not is_manager:
+        conditions.append(or_(Request.client_id == current_user.id, Request.executor_id == current_user.id))
+    if expected_status is not None:
+        conditions.append(Request.status == expected_status)
+    if request_update.version is not None:
+        conditions.append(Request.version == request_update.version)
+    
+    values = {}
+    if target_status:
+        values["status"] = target_status
+        if target_status == RequestStatus.IN_PROGRESS:
+            values["started_at"] = func.coalesce(Request.started_at, datetime.utcnow())
+        if target_status == RequestStatus.COMPLETED:
+            values["completed_at"] = func.coalesce(Request.completed_at, datetime.utcnow())
     
     if request_update.priority and is_manager:
-        request.priority = request_update.priority
+        values["priority"] = request_update.priority
+    
+    # Only the owner may change the description; client_id never changes, so
+    # it can be checked before the UPDATE
+    if request_update.description:
+        if current is None:
+            current = await updatable_request(db, request_id, current_user, is_manager)
+        if current.client_id == current_user.id:
+            values["description"] = request_update.description
+            if search.is_supported(db):
+                values["search_vector"] = search.request_vector(literal(request_update.description))
+    
+    request = None
+    if values:
+        result = await db.execute(
+            update(Request).where(*conditions).values(**values).returning(Request),
+            execution_options={"synchronize_session": False}
+        )
+        request = result.scalars().first()
+    else:
+        result = await db.execute(select(Request).where(*conditions))
+        request = result.scalars().first()
+    
+    if request is None:
+        # Nothing matched: tell why
+        current = await updatable_request(db, request_id, current_user, is_manager)
+        if request_update.version is not None and current.version != request_update.version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Request was modified (current version {current.version})"
+            )
+        if target_status is not None:
+            raise transition_conflict(current.status, target_status)
+        if expected_status is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Request status is {current.status.value}, not {expected_status.value}"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Request was modified concurrently"
+        )
+    
+    if not values:
+        return request
     
-    db.commit()
-    db.refresh(request)
+    if target_status:
+        counter_keys = request_counter_keys(Request(
+            status=expected_status, type=request.type, created_at=request.created_at, executor_id=request.executor_id
+        ))
+        await apply_counter_delta(db, counter_delta(counter_keys, request_counter_keys(request)))
+        await request_events.emit(db, "request_status_changed", request, previous_status=expected_status.value)
+    else:
+        await request_events.emit(db, "request_updated", request)
+    await db.commit()
     
     return request
 
@@ -481,21 +1203,37 @@ async def update_request(
 async def assign_request(
     request_id: int,
     assign_data: RequestAssign,
-    current_user: User = Depends(require_manager),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Assign executor to request (managers and admins only)
+    
+    NEW requests are assigned, ASSIGNED and IN_PROGRESS ones reassigned
+    (ASSIGNABLE_STATUSES); closed requests get 409.
     """
-    request = db.query(Request).filter(Request.id == request_id).first()
-    if not request:
+    # Row locked: the counter delta is computed from this state
+    result = await db.execute(
+        select(
+            Request.id, Request.client_id, Request.executor_id, Request.status, Request.type, Request.created_at,
+            Request.version
+        )
+        .where(Request.id == request_id)
+        .with_for_update()
+    )
+    current = result.first()
+    if not current:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Request not found"
         )
     
+    if current.status not in ASSIGNABLE_STATUSES:
+        raise transition_conflict(current.status, RequestStatus.ASSIGNED)
+    
     # Check if executor exists and has executor role
-    executor = db.query(User).filter(User.id == assign_data.executor_id).first()
+    result = await db.execute(select(User).where(User.id == assign_data.executor_id))
+    executor = result.scalars().first()
     if not executor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -508,13 +1246,33 @@ async def assign_request(
             detail="User is not an executor"
         )
     
-    # Assign executor
-    request.executor_id = assign_data.executor_id
-    request.status = RequestStatus.ASSIGNED
-    request.assigned_at = datetime.utcnow()
+    # Assign executor. The status and version conditions guard the read on
+    # SQLite, where FOR UPDATE is a no-op
+    result = await db.execute(
+        update(Request)
+        .where(
+            Request.id == request_id,
+            Request.status.in_(ASSIGNABLE_STATUSES),
+            Request.version == current.version
+        )
+        .values(executor_id=assign_data.executor_id, status=RequestStatus.ASSIGNED, assigned_at=datetime.utcnow())
+        .returning(Request),
+        execution_options={"synchronize_session": False}
+    )
+    request = result.scalars().first()
+    if request is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Request was modified concurrently"
+        )
     
-    db.commit()
-    db.refresh(request)
+    await apply_counter_delta(db, counter_delta(request_counter_keys(current), request_counter_keys(request)))
+    if current.executor_id is not None and current.executor_id != request.executor_id:
+        db.add(RequestTombstone(
+            request_id=request.id, executor_id=current.executor_id, reason=TombstoneReason.UNASSIGNED
+        ))
+    await request_events.emit(db, "request_assigned", request, previous_executor_id=current.executor_id)
+    await db.commit()
     
     return request
 
@@ -522,28 +1280,54 @@ async def assign_request(
 @app.delete("/api/requests/{request_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_request(
     request_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete request
     """
-    request = db.query(Request).filter(Request.id == request_id).first()
-    if not request:
+    result = await db.execute(select(Request.client_id).where(Request.id == request_id))
+    owner = result.first()
+    if not owner:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Request not found"
         )
     
     # Only client who created or admin can delete
-    if request.client_id != current_user.id and current_user.role != UserRole.ADMIN:
+    if owner.client_id != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to delete this request"
         )
     
-    db.delete(request)
-    db.commit()
+    # Comments first: their foreign key has no ON DELETE CASCADE
+    await db.execute(delete(Comment).where(Comment.request_id == request_id))
+    # The counter delta is computed from the row as it was deleted, not from
+    # an earlier read a concurrent assignment or delete may have outdated
+    result = await db.execute(
+        delete(Request)
+        .where(Request.id == request_id)
+        .returning(
+            Request.id, Request.client_id, Request.executor_id, Request.status, Request.type, Request.created_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+    request = result.first()
+    if not request:
+        # Deleted concurrently
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Request not found"
+        )
+    
+    await apply_counter_delta(db, counter_delta(request_counter_keys(request), []))
+    await request_events.emit(db, "request_deleted", request)
+    db.add(RequestTombstone(
+        request_id=request.id, client_id=request.client_id, executor_id=request.executor_id,
+        reason=TombstoneReason.DELETED
+    ))
+    await db.commit()
     
     return None
 
@@ -553,14 +1337,17 @@ async def delete_request(
 @app.get("/api/requests/{request_id}/comments", response_model=List[CommentWithUser])
 async def get_request_comments(
     request_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    http_request: HTTPRequest,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get comments for a request
     """
     # Check if request exists and user has access
-    request = db.query(Request).filter(Request.id == request_id).first()
+    result = await db.execute(select(Request).where(Request.id == request_id))
+    request = result.scalars().first()
     if not request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -574,21 +1361,35 @@ async def get_request_comments(
             detail="Not authorized to view comments for this request"
         )
     
-    comments = db.query(Comment).filter(Comment.request_id == request_id).order_by(Comment.created_at).all()
+    result = await db.execute(
+        select(Comment)
+        .options(*COMMENT_USER_OPTIONS)
+        .where(Comment.request_id == request_id)
+        .order_by(Comment.created_at)
+    )
+    comments = result.scalars().all()
+    
+    # Comments are never edited, only their authors' profiles change
+    etag = make_etag([(comment.id, user_version(comment.user)) for comment in comments])
+    cached = not_modified(http_request, response, "get_request_comments", etag)
+    if cached:
+        return cached
+    
     return comments
 
 
 @app.post("/api/comments", response_model=CommentInDB, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     comment_data: CommentCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a comment on a request
     """
     # Check if request exists
-    request = db.query(Request).filter(Request.id == comment_data.request_id).first()
+    result = await db.execute(select(Request).where(Request.id == comment_data.request_id))
+    request = result.scalars().first()
     if not request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -615,55 +1416,212 @@ async def create_comment(
     )
     
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    await db.flush()
+    await search.index_comment(db, comment_data.request_id, comment_data.text)
+    await request_events.emit(db, "comment_added", request, comment_id=new_comment.id, user_id=current_user.id)
+    await db.commit()
+    await db.refresh(new_comment)
     
     return new_comment
 
 
+# ==================== Real-time Events ====================
+
+@app.websocket("/ws/requests")
+async def request_events_socket(websocket: WebSocket, token: str):
+    """
+    Push request events to the frontend instead of re-fetching the list
+    
+    Browsers cannot set headers on WebSocket connections, so the access token
+    is passed as the `token` query parameter. Each message is a JSON event
+    (request_created, request_assigned, request_status_changed,
+    request_updated, request_deleted, comment_added, request_overdue,
+    request_deadline_approaching) scoped like
+    GET /api/requests; "resync" means events were missed and the list should
+    be reloaded, "ping" keeps idle connections alive.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            current_user = await authenticate_token(token, db)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    
+    await websocket.accept()
+    subscription = request_events.subscribe(current_user)
+    
+    async def forward_events():
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), timeout=PING_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                payload = {"event": "ping"}
+            await websocket.send_json(payload)
+    
+    sender = asyncio.create_task(forward_events())
+    try:
+        # Client messages are ignored; reading detects the disconnect right away
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        request_events.unsubscribe(subscription)
+
+
 # ==================== Statistics ====================
 
 @app.get("/api/stats/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
-    current_user: User = Depends(require_manager),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get dashboard statistics (managers and admins only)
     """
-    total_requests = db.query(func.count(Request.id)).scalar()
-    new_requests = db.query(func.count(Request.id)).filter(Request.status == RequestStatus.NEW).scalar()
-    in_progress_requests = db.query(func.count(Request.id)).filter(
-        Request.status.in_([RequestStatus.ASSIGNED, RequestStatus.IN_PROGRESS])
-    ).scalar()
-    completed_requests = db.query(func.count(Request.id)).filter(Request.status == RequestStatus.COMPLETED).scalar()
+    # Request totals from the materialized status counters (see stats.py)
+    def status_count(*statuses: RequestStatus):
+        query = select(func.coalesce(func.sum(RequestCounter.count), 0)).where(RequestCounter.dimension == "status")
+        if statuses:
+            query = query.where(RequestCounter.key.in_([s.value for s in statuses]))
+        return query.scalar_subquery()
+    
+    request_totals = select(
+        status_count().label("total_requests"),
+        status_count(RequestStatus.NEW).label("new_requests"),
+        status_count(*ACTIVE_REQUEST_STATUSES).label("in_progress_requests"),
+        status_count(RequestStatus.COMPLETED).label("completed_requests")
+    ).subquery()
+    
+    user_totals = select(
+        func.count(User.id).label("total_users"),
+        func.count(User.id).filter(User.role == UserRole.CLIENT).label("total_clients"),
+        func.count(User.id).filter(User.role == UserRole.EXECUTOR).label("total_executors")
+    ).subquery()
+    
+    # Active task count per executor from the executor counters
+    executor_load = (
+        select(
+            User.id.label("executor_id"),
+            User.fullname.label("executor_fullname"),
+            func.coalesce(RequestCounter.count, 0).label("active_tasks")
+        )
+        .outerjoin(RequestCounter, and_(
+            RequestCounter.dimension == "executor",
+            RequestCounter.key == cast(User.id, String)
+        ))
+        .where(User.role == UserRole.EXECUTOR)
+        .subquery()
+    )
     
-    total_users = db.query(func.count(User.id)).scalar()
-    total_clients = db.query(func.count(User.id)).filter(User.role == UserRole.CLIENT).scalar()
-    total_executors = db.query(func.count(User.id)).filter(User.role == UserRole.EXECUTOR).scalar()
+    # Single round trip: totals repeated on every executor row (one row if there are no executors)
+    result = await db.execute(
+        select(request_totals, user_totals, executor_load)
+        .select_from(
+            request_totals
+            .join(user_totals, true())
+            .outerjoin(executor_load, true())
+        )
+        .order_by(executor_load.c.executor_id)
+    )
+    rows = result.all()
+    totals = rows[0]
     
     return DashboardStats(
-        total_requests=total_requests,
-        new_requests=new_requests,
-        in_progress_requests=in_progress_requests,
-        completed_requests=completed_requests,
-        total_users=total_users,
-        total_clients=total_clients,
-        total_executors=total_executors
+        total_requests=totals.total_requests,
+        new_requests=totals.new_requests,
+        in_progress_requests=totals.in_progress_requests,
+        completed_requests=totals.completed_requests,
+        total_users=totals.total_users,
+        total_clients=totals.total_clients,
+        total_executors=totals.total_executors,
+        executor_load=[
+            ExecutorLoad(id=row.executor_id, fullname=row.executor_fullname, active_tasks=row.active_tasks)
+            for row in rows
+            if row.executor_id is not None
+        ]
+    )
+
+
+@app.get("/api/executors/workload", response_model=List[ExecutorWorkload])
+async def get_executors_workload(
+    current_user: AuthenticatedUser = Depends(require_manager),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get all executors with their active task counts (managers and admins only)
+    """
+    # Task counts per executor in one GROUP BY over active requests
+    task_counts = (
+        select(
+            Request.executor_id,
+            func.count(Request.id).filter(Request.status == RequestStatus.ASSIGNED).label("assigned_tasks"),
+            func.count(Request.id).filter(Request.status == RequestStatus.IN_PROGRESS).label("in_progress_tasks")
+        )
+        .where(Request.executor_id.is_not(None), Request.status.in_(ACTIVE_REQUEST_STATUSES))
+        .group_by(Request.executor_id)
+        .subquery()
     )
+    
+    assigned_tasks = func.coalesce(task_counts.c.assigned_tasks, 0)
+    in_progress_tasks = func.coalesce(task_counts.c.in_progress_tasks, 0)
+    result = await db.execute(
+        select(
+            User.id,
+            User.username,
+            User.fullname,
+            assigned_tasks.label("assigned_tasks"),
+            in_progress_tasks.label("in_progress_tasks")
+        )
+        .outerjoin(task_counts, task_counts.c.executor_id == User.id)
+        .where(User.role == UserRole.EXECUTOR)
+        .order_by(User.id)
+    )
+    
+    return [
+        ExecutorWorkload(
+            id=row.id,
+            username=row.username,
+            fullname=row.fullname,
+            active_tasks=row.assigned_tasks + row.in_progress_tasks,
+            assigned_tasks=row.assigned_tasks,
+            in_progress_tasks=row.in_progress_tasks
+        )
+        for row in result.all()
+    ]
+
+
+# ==================== Metrics ====================
+
+@app.get("/api/metrics")
+async def get_metrics(current_user: AuthenticatedUser = Depends(require_admin)):
+    """
+    Get internal runtime metrics (admins only)
+    """
+    return {
+        "password_hashing": password_hash_pool.stats(),
+        "user_cache": user_cache.stats(),
+        "db_pool": pool_stats.stats(async_engine.pool),
+        "request_events": request_events.stats(),
+        "dispatch": dispatcher.stats(),
+        "sla": sla_monitor.stats(),
+        "etag": etag_stats.stats()
+    }
 
 
 # ==================== System Settings ====================
 
 @app.get("/api/settings", response_model=List[SystemSettingInDB])
 async def get_settings(
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all system settings (admins only)
     """
-    settings = db.query(SystemSettings).all()
+    result = await db.execute(select(SystemSettings))
+    settings = result.scalars().all()
     return settings
 
 
@@ -671,23 +1629,34 @@ async def get_settings(
 async def update_setting(
     setting_key: str,
     setting_update: SystemSettingUpdate,
-    current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update system setting (admins only)
     """
-    setting = db.query(SystemSettings).filter(SystemSettings.key == setting_key).first()
+    result = await db.execute(select(SystemSettings).where(SystemSettings.key == setting_key))
+    setting = result.scalars().first()
     if not setting:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Setting not found"
         )
     
+    try:
+        system_settings_cache.parse(setting_key, setting_update.value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid value for this setting"
+        )
+    
     setting.value = setting_update.value
     
-    db.commit()
-    db.refresh(setting)
+    await system_settings_cache.notify(db, setting_key)
+    await db.commit()
+    await db.refresh(setting)
+    system_settings_cache.set(setting.key, setting.value)
     
     return setting
 
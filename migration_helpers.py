@@ -0,0 +1,73 @@
+"""
+Helpers for alembic revisions (alembic/versions)
+
+Indexes added after the baseline are built with CREATE INDEX CONCURRENTLY on
+PostgreSQL: the build takes a SHARE UPDATE EXCLUSIVE lock, so inserts and
+updates of a large requests table keep running while it is in progress.
+CONCURRENTLY cannot run inside a transaction, so the helpers switch the
+migration connection to autocommit for the duration of the statement.
+
+Databases built by an earlier version of revision 0001 already have some
+objects that later revisions add; has_table() and has_column() let those
+revisions skip them.
+"""
+
+from typing import Sequence
+
+from alembic import context, op
+from sqlalchemy import inspect, text
+
+
+def _index_valid(index_name: str):
+    """True/False for an existing (valid/invalid) index, None if it does not exist"""
+    return op.get_bind().execute(
+        text(
+            "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": index_name}
+    ).scalar()
+
+
+def has_table(table_name: str) -> bool:
+    """True if the table exists (always False when generating SQL offline)"""
+    if context.is_offline_mode():
+        return False
+    return inspect(op.get_bind()).has_table(table_name)
+
+
+def has_column(table_name: str, column_name: str) -> bool:
+    """True if the table has the column (always False when generating SQL offline)"""
+    if context.is_offline_mode():
+        return False
+    return any(column["name"] == column_name for column in inspect(op.get_bind()).get_columns(table_name))
+
+
+def create_index_concurrently(index_name: str, table_name: str, columns: Sequence[str], **kw):
+    """
+    Create an index without blocking writes
+
+    Skips indexes that already exist (e.g. built by an earlier create_all) and
+    rebuilds ones left INVALID by an interrupted concurrent build.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        op.create_index(index_name, table_name, columns, if_not_exists=True, **kw)
+        return
+
+    with op.get_context().autocommit_block():
+        valid = None if context.is_offline_mode() else _index_valid(index_name)
+        if valid:
+            return
+        if valid is False:
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+        op.create_index(index_name, table_name, columns, postgresql_concurrently=True, **kw)
+
+
+def drop_index_concurrently(index_name: str, table_name: str):
+    """Drop an index without blocking reads and writes of the table"""
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
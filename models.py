@@ -1,6 +1,9 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Enum, Text, Index, UniqueConstraint, Sequence, text, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
 from database import Base
 import enum
 
@@ -29,6 +32,75 @@ class RequestStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses counted as an executor's current workload
+ACTIVE_REQUEST_STATUSES = (RequestStatus.ASSIGNED, RequestStatus.IN_PROGRESS)
+
+# Requests in these statuses are done with; the rest are open
+CLOSED_REQUEST_STATUSES = (RequestStatus.COMPLETED, RequestStatus.CANCELLED)
+
+
+# Global change counter of requests and their tombstones (GET /api/requests/changes)
+request_version_seq = Sequence("request_version_seq", metadata=Base.metadata)
+
+
+class next_request_version(FunctionElement):
+    """
+    Next value of the request change counter
+    
+    A PostgreSQL sequence; SQLite (single writer) takes max + 1 instead.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(next_request_version)
+def _next_request_version_default(element, compiler, **kw):
+    return (
+        "(SELECT coalesce(max(version), 0) + 1 FROM "
+        "(SELECT version FROM requests UNION ALL SELECT version FROM request_tombstones))"
+    )
+
+
+@compiles(next_request_version, "postgresql")
+def _next_request_version_postgresql(element, compiler, **kw):
+    return f"nextval('{request_version_seq.name}')"
+
+
+class current_transaction_id(FunctionElement):
+    """
+    Id of the transaction writing a request version (GET /api/requests/changes)
+    
+    Sequence values are taken when a row is written but become visible when
+    its transaction commits, so versions can appear out of order; the feed
+    orders by (writer transaction, version) instead and holds back writers
+    newer than the oldest one still running (snapshot_xmin()). SQLite has a
+    single writer, whose versions become visible in order: 0 there.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_transaction_id)
+def _current_transaction_id_default(element, compiler, **kw):
+    return "0"
+
+
+@compiles(current_transaction_id, "postgresql")
+def _current_transaction_id_postgresql(element, compiler, **kw):
+    return "pg_current_xact_id()::text::bigint"
+
+
+class snapshot_xmin(FunctionElement):
+    """Oldest transaction still running: all writers below it have finished (PostgreSQL)"""
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(snapshot_xmin, "postgresql")
+def _snapshot_xmin_postgresql(element, compiler, **kw):
+    return "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
 class RequestType(str, enum.Enum):
     """Types of problems/requests"""
     PLUMBING = "plumbing"
@@ -39,6 +111,12 @@ class RequestType(str, enum.Enum):
     OTHER = "other"
 
 
+class TombstoneReason(str, enum.Enum):
+    """Why a request left a user's view"""
+    DELETED = "deleted"        # seen by its client, executor and managers
+    UNASSIGNED = "unassigned"  # reassigned away from executor_id, seen by that executor
+
+
 class User(Base):
     """User model - represents all types of users in the system"""
     __tablename__ = "users"
@@ -55,13 +133,39 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    requests = relationship("Request", back_populates="client", foreign_keys="Request.client_id")
-    assigned_requests = relationship("Request", back_populates="executor", foreign_keys="Request.executor_id")
+    # lazy="raise": relationships must be eager-loaded explicitly (no N+1 queries)
+    requests = relationship("Request", back_populates="client", foreign_keys="Request.client_id", lazy="raise")
+    assigned_requests = relationship("Request", back_populates="executor", foreign_keys="Request.executor_id", lazy="raise")
+    
+    __table_args__ = (
+        # Keyset pagination of GET /api/users
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Substring search of GET /api/users (PostgreSQL pg_trgm)
+        Index(
+            "ix_users_username_trgm", "username",
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_fullname_trgm", "fullname",
+            postgresql_using="gin", postgresql_ops={"fullname": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
     
     def __repr__(self):
         return f"<User(id={self.id}, username={self.username}, role={self.role})>"
 
 
+class ExecutorSkill(Base):
+    """Request type an executor handles (an executor without skills handles any type)"""
+    __tablename__ = "executor_skills"
+    
+    executor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    type = Column(Enum(RequestType), primary_key=True)
+    
+    def __repr__(self):
+        return f"<ExecutorSkill(executor_id={self.executor_id}, type={self.type})>"
+
+
 class Request(Base):
     """Request model - service requests from clients"""
     __tablename__ = "requests"
@@ -77,22 +181,81 @@ class Request(Base):
     priority = Column(Integer, default=1)  # 1=normal, 2=high, 3=urgent
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     assigned_at = Column(DateTime(timezone=True), nullable=True)
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
     deadline = Column(DateTime(timezone=True), nullable=True)
     
+    # Bumped on every insert and update; with the writing transaction, the
+    # position of the change in GET /api/requests/changes
+    version = Column(BigInteger, default=next_request_version(), onupdate=next_request_version(), nullable=False)
+    version_xid = Column(
+        BigInteger, default=current_transaction_id(), onupdate=current_transaction_id(), nullable=False
+    )
+    
+    # Full-text search over description and comments (see search.py); not loaded by default
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
+    
     # Relationships
-    client = relationship("User", back_populates="requests", foreign_keys=[client_id])
-    executor = relationship("User", back_populates="assigned_requests", foreign_keys=[executor_id])
-    comments = relationship("Comment", back_populates="request", cascade="all, delete-orphan")
+    client = relationship("User", back_populates="requests", foreign_keys=[client_id], lazy="raise")
+    executor = relationship("User", back_populates="assigned_requests", foreign_keys=[executor_id], lazy="raise")
+    comments = relationship("Comment", back_populates="request", cascade="all, delete-orphan", lazy="raise")
+    
+    __table_args__ = (
+        # Keyset pagination of GET /api/requests
+        Index("ix_requests_created_at_id", "created_at", "id"),
+        # Role-scoped GET /api/requests (clients by client_id, executors by executor_id,
+        # managers by status), each in keyset order
+        Index("ix_requests_client_created_at", "client_id", "created_at", "id"),
+        Index("ix_requests_executor_status_created_at", "executor_id", "status", "created_at", "id",
+              postgresql_where=text("executor_id IS NOT NULL")),
+        Index("ix_requests_status_created_at", "status", "created_at", "id"),
+        # GET /api/requests/changes
+        Index("ix_requests_version", "version", unique=True),
+        Index("ix_requests_version_xid", "version_xid", "version"),
+        # GET /api/requests/search
+        Index("ix_requests_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # SLA monitor (sla.py): open requests by deadline
+        Index("ix_requests_open_deadline", "deadline",
+              postgresql_where=text("status NOT IN ('COMPLETED', 'CANCELLED')"),
+              sqlite_where=text("status NOT IN ('COMPLETED', 'CANCELLED')")),
+        # GET /api/requests?order=priority: open requests in request_queue_key() order
+        Index("ix_requests_open_queue", text("(-priority)"), text("COALESCE(deadline, 'infinity')"), "id",
+              postgresql_where=text("status NOT IN ('COMPLETED', 'CANCELLED')"),
+              sqlite_where=text("status NOT IN ('COMPLETED', 'CANCELLED')")),
+    )
     
     def __repr__(self):
         return f"<Request(id={self.id}, type={self.type}, status={self.status})>"
 
 
+def request_is_open():
+    """
+    Filter on open requests matching the predicate of the partial indexes
+    
+    The statuses are inlined rather than bound, so the planner can use those
+    indexes with generic (prepared statement) plans too.
+    """
+    return Request.status.not_in([literal_column(f"'{status.name}'") for status in CLOSED_REQUEST_STATUSES])
+
+
+# Sorts after every deadline: 'infinity' on PostgreSQL, after any ISO date string on SQLite
+NO_DEADLINE = literal_column("'infinity'")
+
+
+def request_queue_key():
+    """
+    Sort key of the priority queue: priority desc, deadline asc (none last), id
+    
+    Priority is negated so every column ascends: a (priority, deadline, id)
+    cursor is then a single row comparison, which ix_requests_open_queue
+    (built on these same expressions) serves as one index range scan.
+    """
+    return -Request.priority, func.coalesce(Request.deadline, NO_DEADLINE), Request.id
+
+
 class Comment(Base):
     """Comment model - comments on requests"""
     __tablename__ = "comments"
@@ -105,13 +268,35 @@ class Comment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    request = relationship("Request", back_populates="comments")
-    user = relationship("User")
+    request = relationship("Request", back_populates="comments", lazy="raise")
+    user = relationship("User", lazy="raise")
     
     def __repr__(self):
         return f"<Comment(id={self.id}, request_id={self.request_id})>"
 
 
+class RequestTombstone(Base):
+    """A request that left someone's view, for GET /api/requests/changes"""
+    __tablename__ = "request_tombstones"
+    
+    id = Column(Integer, primary_key=True)
+    request_id = Column(Integer, nullable=False)
+    client_id = Column(Integer, nullable=True)
+    executor_id = Column(Integer, nullable=True)
+    reason = Column(Enum(TombstoneReason), nullable=False)
+    version = Column(BigInteger, default=next_request_version(), nullable=False)
+    version_xid = Column(BigInteger, default=current_transaction_id(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_request_tombstones_version", "version", unique=True),
+        Index("ix_request_tombstones_version_xid", "version_xid", "version"),
+    )
+    
+    def __repr__(self):
+        return f"<RequestTombstone(request_id={self.request_id}, reason={self.reason})>"
+
+
 class SystemSettings(Base):
     """System settings table"""
     __tablename__ = "system_settings"
@@ -124,3 +309,28 @@ class SystemSettings(Base):
     
     def __repr__(self):
         return f"<SystemSettings(key={self.key}, value={self.value})>"
+
+
+class RequestCounter(Base):
+    """
+    Materialized request statistics, maintained incrementally by the request handlers.
+    
+    One row per (dimension, key):
+        status   - requests per status ("new", "assigned", ...)
+        type     - requests per type ("plumbing", ...)
+        executor - active (assigned + in progress) requests per executor id
+        day      - requests created per day ("2024-01-31")
+    """
+    __tablename__ = "request_counters"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    dimension = Column(String(20), nullable=False)
+    key = Column(String(50), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint("dimension", "key", name="uq_request_counters_dimension_key"),
+    )
+    
+    def __repr__(self):
+        return f"<RequestCounter(dimension={self.dimension}, key={self.key}, count={self.count})>"
@@ -0,0 +1,140 @@
+import base64
+import enum
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, String, literal
+from sqlalchemy.types import TypeDecorator
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class RequestOrder(str, enum.Enum):
+    """Orderings of GET /api/requests"""
+    CREATED = "created"    # newest first
+    PRIORITY = "priority"  # open requests only, most urgent first (priority desc, deadline asc)
+
+
+def _encode(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the (created_at, id) position of the last row of a page
+    into an opaque URL-safe cursor
+    """
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+class StoredDateTime(TypeDecorator):
+    """
+    Binds a cursor datetime in the format the column stores
+
+    SQLite keeps datetimes as text compared character by character: rows
+    created through the CURRENT_TIMESTAMP default hold 'YYYY-MM-DD HH:MM:SS',
+    while a datetime bound as-is becomes 'YYYY-MM-DD HH:MM:SS.000000' and
+    sorts after every row of that second, so the next page would repeat them.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return value.strftime("%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S")
+
+
+def cursor_position(cursor: str) -> tuple:
+    """
+    (created_at, id) bind values of a cursor produced by encode_cursor,
+    to compare against tuple_(<model>.created_at, <model>.id)
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    created_at, row_id = decode_cursor(cursor)
+    return literal(created_at, StoredDateTime()), row_id
+
+
+def encode_queue_cursor(priority: int, deadline: Optional[datetime], row_id: int) -> str:
+    """Encode the (priority, deadline, id) position of the last row of a RequestOrder.PRIORITY page"""
+    return _encode([priority, deadline.isoformat() if deadline else None, row_id])
+
+
+def decode_queue_cursor(cursor: str) -> Tuple[int, Optional[datetime], int]:
+    """
+    Decode a cursor produced by encode_queue_cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        priority, deadline, row_id = _decode(cursor)
+        return int(priority), datetime.fromisoformat(deadline) if deadline else None, int(row_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def encode_changes_cursor(version_xid: int, version: int) -> str:
+    """Encode a (version_xid, version) position of GET /api/requests/changes"""
+    return _encode([version_xid, version])
+
+
+def decode_changes_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor produced by encode_changes_cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        version_xid, version = _decode(cursor)
+        return int(version_xid), int(version)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def next_cursor(rows: list, limit: int, order: RequestOrder = RequestOrder.CREATED) -> Optional[str]:
+    """Cursor for the page after rows, or None if this is the last page"""
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    if order == RequestOrder.PRIORITY:
+        return encode_queue_cursor(last.priority, last.deadline, last.id)
+    return encode_cursor(last.created_at, last.id)
@@ -37,6 +37,17 @@ echo [WARNING] Make sure PostgreSQL is running and database is created!
 echo [INFO] If database not created, run: psql -U postgres -f init_db.sql
 echo.
 
+REM Apply database migrations
+echo [INFO] Applying database migrations...
+python -c "from database import init_db; init_db()"
+if errorlevel 1 (
+    echo [ERROR] Database migration failed
+    pause
+    exit /b 1
+)
+echo [SUCCESS] Database schema is up to date
+echo.
+
 REM Run the application
 echo ===================================
 echo    Starting Application
@@ -57,6 +57,16 @@ class UserPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ExecutorSkillsUpdate(BaseModel):
+    """Request types an executor handles (empty: any type)"""
+    types: List[RequestType]
+
+
+class ExecutorSkills(ExecutorSkillsUpdate):
+    """Executor skills used by automatic dispatch"""
+    executor_id: int
+
+
 # ==================== Request Schemas ====================
 
 class RequestBase(BaseModel):
@@ -75,6 +85,10 @@ class RequestUpdate(BaseModel):
     description: Optional[str] = Field(None, min_length=10, max_length=2000)
     status: Optional[RequestStatus] = None
     priority: Optional[int] = Field(None, ge=1, le=3)
+    # Optimistic concurrency: the update fails with 409 unless the request is
+    # still in this status / at this version
+    expected_status: Optional[RequestStatus] = None
+    version: Optional[int] = None
 
 
 class RequestAssign(BaseModel):
@@ -82,6 +96,26 @@ class RequestAssign(BaseModel):
     executor_id: int
 
 
+class RequestAssignBatchItem(RequestAssign):
+    """One assignment of a batch"""
+    request_id: int
+
+
+class RequestAssignBatchItemResult(RequestAssignBatchItem):
+    """Outcome of one assignment of a batch"""
+    assigned: bool
+    detail: Optional[str] = None   # why the item was rejected
+    version: Optional[int] = None  # version of the assigned request
+
+
+class RequestAssignBatchResult(BaseModel):
+    """Outcome of a batch assignment"""
+    assigned: int
+    failed: int
+    results: List[RequestAssignBatchItemResult]  # in input order
+    elapsed_ms: float
+
+
 class RequestInDB(RequestBase):
     """Request schema from database"""
     id: int
@@ -95,6 +129,7 @@ class RequestInDB(RequestBase):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     deadline: Optional[datetime] = None
+    version: int
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -107,6 +142,50 @@ class RequestWithDetails(RequestInDB):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RequestChanges(BaseModel):
+    """Requests changed and removed since a feed position"""
+    changed: List[RequestWithDetails]
+    deleted: List[int]          # request ids that left the user's view
+    next_since: str             # opaque; pass as `since` on the next poll
+    has_more: bool
+
+
+class RequestImportItem(RequestCreate):
+    """One request of a bulk import"""
+    client_id: Optional[int] = None  # defaults to the importing user
+    priority: int = Field(1, ge=1, le=3)
+
+
+class RequestImportError(BaseModel):
+    """A rejected import item"""
+    index: int  # position in the input (line number - 1 for NDJSON)
+    detail: str
+
+
+class RequestImportResult(BaseModel):
+    """Outcome of a bulk import"""
+    imported: int
+    failed: int
+    ids: List[int]  # ids of the imported requests, in input order
+    errors: List[RequestImportError]
+    elapsed_ms: float
+    rows_per_second: float
+
+
+class DispatchAssignment(BaseModel):
+    """A request assigned by automatic dispatch"""
+    request_id: int
+    executor_id: int
+
+
+class DispatchResult(BaseModel):
+    """Outcome of a dispatch round"""
+    assigned: int
+    assignments: List[DispatchAssignment]
+    elapsed_ms: float
+    requests_per_second: float
+
+
 # ==================== Comment Schemas ====================
 
 class CommentBase(BaseModel):
@@ -151,6 +230,16 @@ class TokenData(BaseModel):
     role: Optional[str] = None
 
 
+class AuthenticatedUser(BaseModel):
+    """Fields of the current user needed for authorization"""
+    id: int
+    role: UserRole
+    status: UserStatus
+    is_active: bool
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 class LoginRequest(BaseModel):
     """Login credentials"""
     username: str
@@ -177,6 +266,23 @@ class SystemSettingInDB(BaseModel):
 
 # ==================== Statistics Schemas ====================
 
+class ExecutorLoad(BaseModel):
+    """Active (assigned + in progress) task count of an executor"""
+    id: int
+    fullname: str
+    active_tasks: int
+
+
+class ExecutorWorkload(BaseModel):
+    """Executor with current task counts"""
+    id: int
+    username: str
+    fullname: str
+    active_tasks: int
+    assigned_tasks: int
+    in_progress_tasks: int
+
+
 class DashboardStats(BaseModel):
     """Dashboard statistics"""
     total_requests: int
@@ -186,3 +292,4 @@ class DashboardStats(BaseModel):
     total_users: int
     total_clients: int
     total_executors: int
+    executor_load: List[ExecutorLoad] = []
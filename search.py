@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Full-text search over request descriptions and comments (PostgreSQL)
+
+requests.search_vector holds the description (weight A) and all comment
+texts (weight B) stemmed with the Russian configuration. The handlers keep it
+current: create_request and description updates recompute it, create_comment
+appends the new comment.
+
+Rebuild all search vectors:
+    python search.py
+"""
+
+from sqlalchemy import func, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Request, Comment
+
+SEARCH_CONFIG = "russian"
+
+
+def is_supported(db) -> bool:
+    """Full-text search needs PostgreSQL; other databases fall back to ILIKE"""
+    return db.bind.dialect.name == "postgresql"
+
+
+def description_vector(description):
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(description, "")), literal_column("'A'"))
+
+
+def comment_vector(text):
+    return func.setweight(func.to_tsvector(SEARCH_CONFIG, text), literal_column("'B'"))
+
+
+def request_vector(description=Request.description):
+    """Search vector of a request row: description (the row's, unless given) plus all its comments"""
+    comments_text = (
+        select(func.string_agg(Comment.text, " "))
+        .where(Comment.request_id == Request.id)
+        .scalar_subquery()
+    )
+    return description_vector(description).op("||")(
+        func.coalesce(comment_vector(comments_text), func.to_tsvector(SEARCH_CONFIG, ""))
+    )
+
+
+def search_query(q: str):
+    """Parse user input (quotes, OR, -word) into a tsquery"""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+
+async def index_request(db: AsyncSession, request_id: int):
+    """Recompute the search vector of one request"""
+    if is_supported(db):
+        await db.execute(
+            update(Request).where(Request.id == request_id).values(search_vector=request_vector())
+        )
+
+
+async def index_comment(db: AsyncSession, request_id: int, text: str):
+    """Append a new comment to the search vector of its request"""
+    if is_supported(db):
+        await db.execute(
+            update(Request)
+            .where(Request.id == request_id)
+            .values(
+                search_vector=func.coalesce(Request.search_vector, func.to_tsvector(SEARCH_CONFIG, "")).op("||")(comment_vector(text)),
+                # Indexing is not a change of the request itself
+                updated_at=Request.updated_at,
+                version=Request.version,
+                version_xid=Request.version_xid
+            )
+        )
+
+
+def rebuild_search_vectors(db: Session):
+    """Recompute search vectors of all requests (sync session)"""
+    if is_supported(db):
+        db.execute(update(Request).values(
+            search_vector=request_vector(), updated_at=Request.updated_at, version=Request.version,
+            version_xid=Request.version_xid
+        ))
+
+
+if __name__ == "__main__":
+    import sys
+    sys.stdout.reconfigure(encoding='utf-8') if hasattr(sys.stdout, 'reconfigure') else None
+
+    from database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rebuild_search_vectors(db)
+        db.commit()
+        print("✓ Поисковые индексы заявок пересчитаны")
+    finally:
+        db.close()
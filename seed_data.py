@@ -12,6 +12,8 @@ from sqlalchemy.orm import Session
 from database import SessionLocal, init_db
 from models import User, Request, Comment, SystemSettings, UserRole, UserStatus, RequestStatus, RequestType
 from auth import get_password_hash
+from stats import rebuild_request_counters
+from search import rebuild_search_vectors
 
 
 def create_test_data():
@@ -278,6 +280,11 @@ def create_test_data():
         db.commit()
         print(f" Создано комментариев: {len(comments_data)}")
         
+        # Заявки добавлены напрямую, минуя API - пересчитываем счетчики статистики
+        rebuild_request_counters(db)
+        rebuild_search_vectors(db)
+        db.commit()
+        
         # 4. Проверка системных настроек
         print("\n4. Проверка системных настроек...")
         setting = db.query(SystemSettings).filter(
@@ -0,0 +1,35 @@
+"""
+Fast JSON responses for list endpoints
+
+FastAPI's default path validates the returned ORM objects against the
+response_model, converts the result to Python primitives and then runs
+json.dumps over them. json_response() validates and serializes in one
+pydantic-core pass (TypeAdapter.dump_json) and sends the bytes as they are.
+The route keeps its response_model for the OpenAPI schema.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, data: Any) -> bytes:
+    """Serialize ORM objects (or models) as `schema`, e.g. List[RequestWithDetails]"""
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def json_response(schema: Any, data: Any, response: Response) -> Response:
+    """JSON response keeping the headers already set on the injected `response`"""
+    return Response(
+        content=dump_json(schema, data),
+        media_type="application/json",
+        headers=dict(response.headers)
+    )
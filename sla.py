@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Deadline (SLA) monitor
+
+create_request sets a deadline response_time_hours ahead; with SLA_MONITOR
+enabled every worker runs a tick each SLA_CHECK_INTERVAL_SECONDS that
+escalates open requests in two stages:
+
+- overdue (deadline passed): priority raised to urgent (3), event request_overdue
+- approaching (deadline within SLA_WARNING_HOURS): priority raised to high (2),
+  event request_deadline_approaching
+
+Requests are found through the partial index ix_requests_open_deadline, so
+completed and cancelled history is never read. Each stage also remembers the
+time of its last complete scan: anything due before it has already been
+handled by the overdue stage, so a tick reads only the requests due from
+then until SLA_WARNING_HOURS ahead and costs the same whether a hundred or a
+million requests are open or overdue. The first tick after start catches up
+on the whole open backlog once.
+
+Escalations bump the request version, so they also appear in
+GET /api/requests/changes. On PostgreSQL an advisory lock lets only one
+worker run a tick at a time.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from events import event_payload, request_events
+from models import Request, request_is_open
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key of the SLA tick
+SLA_LOCK_ID = 7310023
+
+
+class SlaStage(NamedTuple):
+    """Escalation applied once a request is `before_deadline` away from its deadline"""
+    event: str
+    priority: int
+    before_deadline: timedelta
+
+
+def sla_stages(warning_hours: float) -> List[SlaStage]:
+    # Overdue first: a request past its deadline is not also reported as approaching it
+    return [
+        SlaStage("request_overdue", 3, timedelta(0)),
+        SlaStage("request_deadline_approaching", 2, timedelta(hours=warning_hours)),
+    ]
+
+
+def escalation_candidates(stage: SlaStage, since: Optional[datetime], now: datetime):
+    """Open requests the stage escalates, by deadline (ix_requests_open_deadline)"""
+    query = select(Request.id, Request.deadline).where(
+        request_is_open(), Request.deadline <= now + stage.before_deadline, Request.priority < stage.priority
+    )
+    if since is not None:
+        query = query.where(Request.deadline >= since)
+    if stage.before_deadline:
+        # Requests already past their deadline belong to the overdue stage
+        query = query.where(Request.deadline > now)
+    return query.order_by(Request.deadline)
+
+
+async def escalate_requests(
+    db: AsyncSession,
+    stage: SlaStage,
+    since: Optional[datetime],
+    now: datetime,
+    limit: int
+) -> Tuple[list, datetime]:
+    """
+    Raise the priority of up to `limit` open requests due between `since` and
+    stage.before_deadline after `now`
+
+    Returns the escalated rows (id, client_id, executor_id, status, deadline)
+    and the deadline the next scan of this stage starts from.
+    """
+    result = await db.execute(escalation_candidates(stage, since, now).limit(limit))
+    candidates = result.all()
+
+    # A full batch: resume from its last deadline (the escalated rows no longer match).
+    # Otherwise everything due before `now` is done: it is past the overdue threshold
+    next_since = candidates[-1].deadline if len(candidates) == limit else now
+    if not candidates:
+        return [], next_since
+
+    # Conditions repeated: a handler may have closed or re-prioritized a request since the read
+    escalate = (
+        update(Request)
+        .where(request_is_open(), Request.priority < stage.priority)
+        .values(priority=stage.priority)
+        .returning(Request.id, Request.client_id, Request.executor_id, Request.status, Request.deadline)
+        .execution_options(synchronize_session=False)
+    )
+    request_ids = [row.id for row in candidates]
+
+    if db.bind.dialect.name == "postgresql":
+        result = await db.execute(escalate.where(Request.id.in_(request_ids)))
+        return result.all(), next_since
+
+    # SQLite evaluates the max + 1 version default once per statement: one row at a time
+    rows = []
+    for request_id in request_ids:
+        result = await db.execute(escalate.where(Request.id == request_id))
+        rows.extend(result.all())
+    return rows, next_since
+
+
+class SlaMonitor:
+    """Background task escalating requests nearing or past their deadline (SLA_MONITOR)"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._scanned_until: Dict[str, datetime] = {}
+        self.ticks = 0
+        self.escalated = Counter()
+        self.errors = 0
+        self.last_tick_ms = 0.0
+
+    async def run_tick(self, db: AsyncSession, warning_hours: float, batch_size: int) -> Dict[str, int]:
+        """One tick, committed; returns the number of requests escalated per event"""
+        started = time.perf_counter()
+        if db.bind.dialect.name == "postgresql":
+            if not await db.scalar(select(func.pg_try_advisory_xact_lock(SLA_LOCK_ID))):
+                await db.rollback()
+                return {}  # another worker is running a tick
+
+        now = datetime.utcnow()
+        escalated = {}
+        scanned = {}
+        payloads = []
+        for stage in sla_stages(warning_hours):
+            rows, scanned[stage.event] = await escalate_requests(
+                db, stage, self._scanned_until.get(stage.event), now, batch_size
+            )
+            escalated[stage.event] = len(rows)
+            payloads.extend(
+                event_payload(
+                    stage.event, row.id, row.client_id, row.executor_id, row.status,
+                    priority=stage.priority, deadline=row.deadline.isoformat()
+                )
+                for row in rows
+            )
+        await request_events.emit_many(db, payloads)
+        await db.commit()
+
+        # Move the watermarks only once the escalations are committed
+        self._scanned_until.update(scanned)
+        self.ticks += 1
+        self.escalated.update(escalated)
+        self.last_tick_ms = round((time.perf_counter() - started) * 1000, 3)
+        return escalated
+
+    def start(self, session_factory, interval: float, warning_hours: float, batch_size: int):
+        async def loop():
+            while True:
+                try:
+                    async with session_factory() as db:
+                        escalated = await self.run_tick(db, warning_hours, batch_size)
+                    # A full batch: more requests are waiting, go again right away
+                    if batch_size in escalated.values():
+                        continue
+                except Exception:
+                    self.errors += 1
+                    logger.exception("SLA tick failed")
+                await asyncio.sleep(interval)
+
+        self._task = asyncio.create_task(loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "ticks": self.ticks,
+            "escalated": dict(self.escalated),
+            "errors": self.errors,
+            "last_tick_ms": self.last_tick_ms,
+        }
+
+
+sla_monitor = SlaMonitor()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Materialized request counters (models.RequestCounter)
+
+The request handlers apply the difference between a request's counter keys
+before and after each change in the same transaction, so the dashboard reads
+a handful of counter rows instead of counting the requests table.
+
+Rebuild the counters from scratch:
+    python stats.py
+"""
+
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Request, RequestCounter, ACTIVE_REQUEST_STATUSES
+
+CounterKey = Tuple[str, str]
+
+
+def utc_day(moment: datetime) -> str:
+    """UTC calendar day of a timestamp, as used for the "day" counters"""
+    if moment is None:
+        moment = datetime.utcnow()
+    elif moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date().isoformat()
+
+
+def request_counter_keys(request: Request) -> List[CounterKey]:
+    """Counter rows a request currently contributes to"""
+    keys = [
+        ("status", request.status.value),
+        ("type", request.type.value),
+        ("day", utc_day(request.created_at)),
+    ]
+    if request.executor_id is not None and request.status in ACTIVE_REQUEST_STATUSES:
+        keys.append(("executor", str(request.executor_id)))
+    return keys
+
+
+def counter_delta(before: Iterable[CounterKey], after: Iterable[CounterKey]) -> Counter:
+    """Per-key increments turning the `before` keys into the `after` keys"""
+    delta = Counter(after)
+    delta.subtract(Counter(before))
+    return Counter({key: value for key, value in delta.items() if value})
+
+
+async def apply_counter_delta(db: AsyncSession, delta: Counter):
+    """Upsert counter increments within the caller's transaction"""
+    if not delta:
+        return
+
+    dialect = db.bind.dialect.name
+    upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+    # Same key order in every transaction: concurrent writers lock the counter
+    # rows in the same order and cannot deadlock
+    for (dimension, key), value in sorted(delta.items()):
+        stmt = upsert(RequestCounter).values(dimension=dimension, key=key, count=value)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RequestCounter.dimension, RequestCounter.key],
+            set_={"count": RequestCounter.count + stmt.excluded.count}
+        )
+        await db.execute(stmt)
+
+
+def rebuild_request_counters(db: Session):
+    """Recompute all counters from the requests table (sync session)"""
+    db.execute(delete(RequestCounter))
+
+    created_at = Request.created_at
+    if db.bind.dialect.name == "postgresql":
+        created_at = func.timezone("UTC", Request.created_at)
+    created_day = func.date(created_at)
+
+    sources = [
+        ("status", select(Request.status, func.count(Request.id)).group_by(Request.status)),
+        ("type", select(Request.type, func.count(Request.id)).group_by(Request.type)),
+        ("day", select(created_day, func.count(Request.id)).group_by(created_day)),
+        ("executor", select(Request.executor_id, func.count(Request.id))
+            .where(Request.executor_id.is_not(None), Request.status.in_(ACTIVE_REQUEST_STATUSES))
+            .group_by(Request.executor_id)),
+    ]
+
+    rows = []
+    for dimension, query in sources:
+        for key, count in db.execute(query).all():
+            if key is None:
+                continue
+            if hasattr(key, "value"):
+                key = key.value
+            elif isinstance(key, date):
+                key = key.isoformat()
+            rows.append({"dimension": dimension, "key": str(key), "count": count})
+
+    if rows:
+        db.execute(insert(RequestCounter), rows)
+
+
+def request_counters_empty(db: Session) -> bool:
+    """True if counters were never built although requests exist"""
+    has_counters = db.execute(select(RequestCounter.id).limit(1)).first() is not None
+    has_requests = db.execute(select(Request.id).limit(1)).first() is not None
+    return has_requests and not has_counters
+
+
+if __name__ == "__main__":
+    import sys
+    sys.stdout.reconfigure(encoding='utf-8') if hasattr(sys.stdout, 'reconfigure') else None
+
+    from database import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rebuild_request_counters(db)
+        db.commit()
+        total = db.scalar(select(func.count(RequestCounter.id)))
+        print(f"✓ Счетчики статистики пересчитаны: {total} строк")
+    finally:
+        db.close()
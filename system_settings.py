@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+In-process cache of the system_settings table
+
+Loaded once at startup and refreshed write-through by PUT /api/settings/{key},
+so hot paths such as create_request read settings without a query. With
+SETTINGS_NOTIFY enabled (PostgreSQL only) every update is also broadcast with
+NOTIFY so the other uvicorn workers refresh their copy.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import SystemSettings
+
+NOTIFY_CHANNEL = "system_settings"
+
+# Known settings: parser and default value
+SETTING_TYPES: Dict[str, Callable[[str], Any]] = {
+    "response_time_hours": int,
+}
+SETTING_DEFAULTS: Dict[str, Any] = {
+    "response_time_hours": 24,
+}
+
+
+class SystemSettingsCache:
+    """Typed key/value cache of system settings"""
+
+    def __init__(self):
+        self._values: Dict[str, Any] = dict(SETTING_DEFAULTS)
+        self._listener = None
+
+    @staticmethod
+    def parse(key: str, value: str) -> Any:
+        """
+        Convert a raw setting value to its declared type
+
+        Raises:
+            ValueError: If the value does not match the setting type
+        """
+        parser = SETTING_TYPES.get(key, str)
+        return parser(value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def set(self, key: str, value: str):
+        """Store a raw value; invalid values fall back to the default"""
+        try:
+            self._values[key] = self.parse(key, value)
+        except ValueError:
+            self._values[key] = SETTING_DEFAULTS.get(key)
+
+    async def load(self, db: AsyncSession):
+        """Load all settings from the database"""
+        result = await db.execute(select(SystemSettings.key, SystemSettings.value))
+        for key, value in result.all():
+            self.set(key, value)
+
+    async def notify(self, db: AsyncSession, key: str):
+        """Broadcast a changed key to other workers (sent on commit)"""
+        if self._listener is not None:
+            await db.execute(text("SELECT pg_notify(:channel, :key)"), {"channel": NOTIFY_CHANNEL, "key": key})
+
+    async def start_listener(self, dsn: str, session_factory):
+        """Refresh keys announced by other workers via LISTEN/NOTIFY"""
+        import asyncpg
+
+        loop = asyncio.get_running_loop()
+
+        async def reload(key: str):
+            async with session_factory() as db:
+                result = await db.execute(select(SystemSettings.value).where(SystemSettings.key == key))
+                value: Optional[str] = result.scalar()
+            if value is not None:
+                self.set(key, value)
+
+        def on_notify(connection, pid, channel, payload):
+            loop.create_task(reload(payload))
+
+        self._listener = await asyncpg.connect(dsn)
+        await self._listener.add_listener(NOTIFY_CHANNEL, on_notify)
+
+    async def stop_listener(self):
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+
+
+system_settings_cache = SystemSettingsCache()
@@ -10,7 +10,7 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 import requests
 import json
-from typing import Optional
+from typing import List, Optional
 
 BASE_URL = "http://127.0.0.1:5500"
 
@@ -18,6 +18,7 @@ class APITester:
     def __init__(self):
         self.token: Optional[str] = None
         self.user_id: Optional[int] = None
+        self.failures: List[str] = []
     
     def print_header(self, text: str):
         """Печать заголовка"""
@@ -25,6 +26,11 @@ class APITester:
         print(f"  {text}")
         print(f"{'='*60}\n")
     
+    def fail(self, message: str):
+        """Печать и учет проваленной проверки: скрипт завершится с кодом 1"""
+        print(f"✗ {message}")
+        self.failures.append(message)
+    
     def print_result(self, response: requests.Response):
         """Печать результата запроса"""
         print(f"Status: {response.status_code}")
@@ -162,8 +168,104 @@ class APITester:
         elif response.status_code == 403:
             print("✗ Нет прав доступа (требуется роль менеджера или администратора)")
     
-    def run_all_tests(self):
-        """Запуск всех тестов"""
+    def test_cursor_paging(self):
+        """Тест курсорной пагинации: каждая страница продвигает курсор вперед"""
+        self.print_header("8. Проверка курсорной пагинации")
+        
+        if not self.token:
+            self.fail("Нет токена. Сначала выполните вход.")
+            return
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        lists = [
+            ("/api/requests", {}),
+            ("/api/requests", {"order": "priority"}),
+            ("/api/users", {}),
+        ]
+        for endpoint, filters in lists:
+            name = f"{endpoint}?order={filters['order']}" if filters else endpoint
+            total = len(requests.get(f"{BASE_URL}{endpoint}", params={**filters, "limit": 100}, headers=headers).json())
+            seen = []
+            cursor = None
+            # Не больше страниц, чем строк: зацикленный курсор не повесит тест
+            for _ in range(total + 1):
+                params = {**filters, "limit": 1}
+                if cursor:
+                    params["cursor"] = cursor
+                response = requests.get(f"{BASE_URL}{endpoint}", params=params, headers=headers)
+                seen.extend(item["id"] for item in response.json())
+                next_cursor = response.headers.get("X-Next-Cursor")
+                if not next_cursor:
+                    break
+                cursor = next_cursor
+            
+            if len(seen) != len(set(seen)):
+                self.fail(f"{name}: курсор не продвигается, строки повторяются: {seen}")
+            elif total < 100 and len(seen) != total:
+                self.fail(f"{name}: получено {len(seen)} строк из {total}")
+            else:
+                print(f"✓ {name}: {len(seen)} страниц(ы) без повторов")
+    
+    def test_query_counts(self):
+        """Тест отсутствия N+1: число SQL-запросов не зависит от размера страницы"""
+        self.print_header("9. Проверка числа SQL-запросов (нужен QUERY_COUNT_HEADER=true)")
+        
+        if not self.token:
+            self.fail("Нет токена. Сначала выполните вход.")
+            return
+        
+        headers = {"Authorization": f"Bearer {self.token}"}
+        
+        # Комментарии: заявка с 1 комментарием и заявка с 20 комментариями
+        counts = []
+        for comment_count in [1, 20]:
+            data = {"type": "other", "description": "Проверка числа SQL-запросов комментариев"}
+            request_id = requests.post(f"{BASE_URL}/api/requests", json=data, headers=headers).json()["id"]
+            for i in range(comment_count):
+                requests.post(
+                    f"{BASE_URL}/api/comments",
+                    json={"request_id": request_id, "text": f"Комментарий {i + 1}"},
+                    headers=headers
+                )
+            response = requests.get(f"{BASE_URL}/api/requests/{request_id}/comments", headers=headers)
+            counts.append(response.headers.get("X-Query-Count"))
+        
+        endpoint = "/api/requests/{id}/comments"
+        if counts[0] is None:
+            print(f"- {endpoint}: заголовок X-Query-Count не включен на сервере")
+            return
+        if counts[0] == counts[1]:
+            print(f"✓ {endpoint}: {counts[0]} SQL-запрос(ов) при 1 и 20 комментариях")
+        else:
+            self.fail(f"{endpoint}: N+1 запросы! 1 комментарий -> {counts[0]}, 20 -> {counts[1]}")
+        
+        # Списки: страница из 1 строки и из 100 строк (заявки выше попадают в поиск)
+        lists = [
+            ("/api/requests", {}),
+            ("/api/requests", {"order": "priority"}),
+            ("/api/requests/search", {"q": "Проверка числа"}),
+            ("/api/requests/changes", {}),
+            ("/api/users", {}),
+        ]
+        for endpoint, filters in lists:
+            name = f"{endpoint}?{'&'.join(f'{key}={value}' for key, value in filters.items())}" if filters else endpoint
+            # Прогрев кэша текущего пользователя
+            requests.get(f"{BASE_URL}{endpoint}", params=filters, headers=headers)
+            counts = []
+            for limit in [1, 100]:
+                response = requests.get(f"{BASE_URL}{endpoint}", params={**filters, "limit": limit}, headers=headers)
+                if response.status_code != 200:
+                    self.fail(f"{name}: статус {response.status_code}")
+                    break
+                counts.append(response.headers.get("X-Query-Count"))
+            else:
+                if counts[0] == counts[1]:
+                    print(f"✓ {name}: {counts[0]} SQL-запрос(ов) при limit=1 и limit=100")
+                else:
+                    self.fail(f"{name}: N+1 запросы! limit=1 -> {counts[0]}, limit=100 -> {counts[1]}")
+    
+    def run_all_tests(self) -> int:
+        """Запуск всех тестов; возвращает код завершения (1, если есть проваленные проверки)"""
         print("\n" + "="*60)
         print("  ТЕСТИРОВАНИЕ API УК ЖКХ")
         print("="*60)
@@ -175,7 +277,7 @@ class APITester:
             response = requests.get(f"{BASE_URL}/docs")
             if response.status_code not in [200, 404]:
                 print("\n✗ API недоступен! Убедитесь, что сервер запущен.")
-                return
+                return 1
             
             # Тесты
             # self.test_register()  # Раскомментируйте для теста регистрации
@@ -185,17 +287,25 @@ class APITester:
             self.test_get_requests()
             self.test_get_users()
             self.test_dashboard_stats()
+            self.test_cursor_paging()
+            self.test_query_counts()
             
             self.print_header("ТЕСТИРОВАНИЕ ЗАВЕРШЕНО")
+            if self.failures:
+                print(f"✗ Проваленных проверок: {len(self.failures)}")
+                return 1
             print("✓ Все тесты выполнены!")
+            return 0
             
         except requests.exceptions.ConnectionError:
             print("\n✗ Не удалось подключиться к API!")
             print("  Убедитесь, что сервер запущен: python main.py")
+            return 1
         except Exception as e:
             print(f"\n✗ Ошибка при тестировании: {e}")
+            return 1
 
 
 if __name__ == "__main__":
     tester = APITester()
-    tester.run_all_tests()
+    sys.exit(tester.run_all_tests())
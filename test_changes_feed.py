@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import sys
+import io
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+"""
+Проверка ленты изменений GET /api/requests/changes при параллельных записях (только PostgreSQL)
+
+Версии заявок берутся из последовательности при записи, а видны становятся
+при фиксации транзакции, поэтому транзакции могут фиксироваться не в порядке
+своих версий. Две сессии воспроизводят это для двух заявок, и проверяется,
+что клиент, опрашивающий ленту между фиксациями, получает обе заявки.
+
+Запуск (база должна быть в актуальной схеме - alembic upgrade head, и
+содержать хотя бы две заявки - python seed_data.py):
+    python test_changes_feed.py
+"""
+
+import asyncio
+import json
+from typing import List, Optional, Set, Tuple
+
+from fastapi import Response
+from sqlalchemy import select, union_all, update
+
+from database import AsyncSessionLocal, SessionLocal
+from models import Request, RequestTombstone, UserRole, UserStatus
+from pagination import encode_changes_cursor
+from schemas import AuthenticatedUser
+from main import get_request_changes
+
+MANAGER = AuthenticatedUser(id=0, role=UserRole.MANAGER, status=UserStatus.CONFIRMED, is_active=True)
+
+# Один цикл событий на все опросы: соединения пула asyncpg привязаны к нему
+loop = asyncio.new_event_loop()
+
+
+async def _poll(since: Optional[str]) -> Tuple[Set[int], str]:
+    changed = set()
+    async with AsyncSessionLocal() as db:
+        while True:
+            response = await get_request_changes(Response(), since, 1000, current_user=MANAGER, db=db)
+            page = json.loads(response.body)
+            changed.update(item["id"] for item in page["changed"])
+            since = page["next_since"]
+            if not page["has_more"]:
+                return changed, since
+
+
+def poll(since: Optional[str]) -> Tuple[Set[int], str]:
+    """Все изменения после since, как их получил бы клиент"""
+    return loop.run_until_complete(_poll(since))
+
+
+def touch(db, request_id: int):
+    """Запись заявки без изменения данных: новая версия"""
+    db.execute(update(Request).where(Request.id == request_id).values(priority=Request.priority))
+
+
+def latest_position(db) -> str:
+    positions = union_all(
+        select(Request.version_xid, Request.version),
+        select(RequestTombstone.version_xid, RequestTombstone.version)
+    ).subquery()
+    row = db.execute(
+        select(positions.c.version_xid, positions.c.version)
+        .order_by(positions.c.version_xid.desc(), positions.c.version.desc())
+        .limit(1)
+    ).first()
+    return encode_changes_cursor(*row)
+
+
+def check(name: str, delivered: Set[int], expected: List[int]) -> bool:
+    missing = [request_id for request_id in expected if request_id not in delivered]
+    if missing:
+        print(f"✗ {name}: лента пропустила заявки {missing}")
+        return False
+    print(f"✓ {name}: доставлены обе заявки")
+    return True
+
+
+def later_version_commits_first(first: int, second: int, since: str) -> Tuple[bool, str]:
+    """A берет версию раньше B, но B фиксируется первой"""
+    a, b = SessionLocal(), SessionLocal()
+    try:
+        touch(a, first)
+        touch(b, second)
+        b.commit()
+        delivered, since = poll(since)
+        a.commit()
+        more, since = poll(since)
+    finally:
+        a.close()
+        b.close()
+    return check("более поздняя версия зафиксирована первой", delivered | more, [first, second]), since
+
+
+def older_transaction_takes_later_version(first: int, second: int, since: str) -> Tuple[bool, str]:
+    """A начинается (получает xid) раньше B, но берет версию позже и фиксируется первой"""
+    a, b = SessionLocal(), SessionLocal()
+    try:
+        a.execute(select(Request.id).where(Request.id == first).with_for_update())
+        touch(b, second)
+        touch(a, first)
+        a.commit()
+        delivered, since = poll(since)
+        b.commit()
+        more, since = poll(since)
+    finally:
+        a.close()
+        b.close()
+    return check("ранняя транзакция с более поздней версией", delivered | more, [first, second]), since
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            print("✗ Проверка ленты изменений требует PostgreSQL")
+            return 1
+        request_ids = db.scalars(select(Request.id).order_by(Request.id).limit(2)).all()
+        since = latest_position(db)
+    finally:
+        db.rollback()
+        db.close()
+
+    if len(request_ids) < 2:
+        print("✗ В базе меньше двух заявок: сначала python seed_data.py")
+        return 1
+
+    _, since = poll(since)
+    results = []
+    for scenario in (later_version_commits_first, older_transaction_takes_later_version):
+        ok, since = scenario(*request_ids, since)
+        results.append(ok)
+
+    if not all(results):
+        print(f"\n✗ Сценариев с пропущенными изменениями: {results.count(False)} из {len(results)}")
+        return 1
+
+    print(f"\n✓ Все {len(results)} сценария доставлены полностью")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
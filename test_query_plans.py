@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import sys
+import io
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+"""
+Проверка планов запросов списка заявок (только PostgreSQL)
+
+Строит те же запросы, что и GET /api/requests для каждой роли, и проверяет
+через EXPLAIN, что таблица requests читается по ожидаемому индексу, а не
+последовательным сканированием. Seq Scan запрещается на время проверки
+(enable_seqscan = off), поэтому результат не зависит от объема данных:
+Seq Scan в плане означает, что подходящего индекса нет.
+
+Запуск (база должна быть в актуальной схеме - alembic upgrade head):
+    python test_query_plans.py
+"""
+
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+
+from database import SessionLocal
+from models import RequestStatus, UserRole, UserStatus
+from pagination import RequestOrder, encode_cursor, encode_queue_cursor
+from schemas import AuthenticatedUser
+from main import request_list_query
+from sla import escalation_candidates, sla_stages
+
+CURSOR = encode_cursor(datetime(2024, 1, 1), 1000)
+QUEUE_CURSOR = encode_queue_cursor(2, datetime(2024, 1, 1), 1000)
+QUEUE_CURSOR_NO_DEADLINE = encode_queue_cursor(2, None, 1000)
+
+# (описание, роль, фильтр статуса, курсор, ожидаемый индекс[, порядок])
+CASES = [
+    ("клиент", UserRole.CLIENT, None, None, "ix_requests_client_created_at"),
+    ("клиент, следующая страница", UserRole.CLIENT, None, CURSOR, "ix_requests_client_created_at"),
+    ("исполнитель", UserRole.EXECUTOR, None, None, "ix_requests_executor_status_created_at"),
+    ("исполнитель, статус", UserRole.EXECUTOR, RequestStatus.IN_PROGRESS, None, "ix_requests_executor_status_created_at"),
+    ("менеджер", UserRole.MANAGER, None, None, "ix_requests_created_at_id"),
+    ("менеджер, статус", UserRole.MANAGER, RequestStatus.NEW, None, "ix_requests_status_created_at"),
+    ("менеджер, статус, следующая страница", UserRole.MANAGER, RequestStatus.NEW, CURSOR, "ix_requests_status_created_at"),
+    ("менеджер, очередь", UserRole.MANAGER, None, None, "ix_requests_open_queue", RequestOrder.PRIORITY),
+    ("менеджер, очередь, следующая страница", UserRole.MANAGER, None, QUEUE_CURSOR, "ix_requests_open_queue",
+     RequestOrder.PRIORITY),
+    ("менеджер, очередь, страница без срока", UserRole.MANAGER, None, QUEUE_CURSOR_NO_DEADLINE,
+     "ix_requests_open_queue", RequestOrder.PRIORITY),
+]
+
+NOW = datetime(2024, 1, 1)
+
+
+def sla_queries():
+    """(описание, запрос, ожидаемый индекс) - выборки монитора сроков (sla.py)"""
+    for stage in sla_stages(warning_hours=2):
+        for since, suffix in ((None, ", первый проход"), (NOW, "")):
+            yield (f"SLA {stage.event}{suffix}", escalation_candidates(stage, since, NOW).limit(1000),
+                   "ix_requests_open_deadline")
+
+
+def plan_nodes(node: dict) -> Iterator[dict]:
+    """Все узлы плана EXPLAIN (FORMAT JSON)"""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db, query) -> dict:
+    """План запроса с подставленными значениями параметров"""
+    compiled = query.compile(bind=db.get_bind(), compile_kwargs={"literal_binds": True})
+    row = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    return row[0]["Plan"]
+
+
+def check_case(db, name: str, role: UserRole, status_filter: Optional[RequestStatus],
+               cursor: Optional[str], expected_index: str, order: RequestOrder = RequestOrder.CREATED) -> bool:
+    user = AuthenticatedUser(id=1, role=role, status=UserStatus.CONFIRMED, is_active=True)
+    query = request_list_query(user, status_filter=status_filter, cursor=cursor, order=order).limit(100)
+    return check_plan(db, name, query, expected_index)
+
+
+def check_plan(db, name: str, query, expected_index: str) -> bool:
+    nodes = [n for n in plan_nodes(explain(db, query)) if n.get("Relation Name") == "requests"
+             or n.get("Index Name", "").startswith("ix_requests_")]
+
+    used: List[str] = [n["Index Name"] for n in nodes if "Index Name" in n]
+    seq_scans = [n for n in nodes if n["Node Type"] == "Seq Scan"]
+
+    if seq_scans or expected_index not in used:
+        print(f"✗ {name}: ожидался {expected_index}, план: "
+              f"{', '.join(n['Node Type'] + (' ' + n['Index Name'] if 'Index Name' in n else '') for n in nodes)}")
+        return False
+
+    print(f"✓ {name}: {expected_index}")
+    return True
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            print("✗ Проверка планов запросов требует PostgreSQL")
+            return 1
+
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        results = [check_case(db, *case) for case in CASES]
+        results += [check_plan(db, *case) for case in sla_queries()]
+    finally:
+        db.rollback()
+        db.close()
+
+    failed = results.count(False)
+    if failed:
+        print(f"\n✗ Запросов без подходящего индекса: {failed} из {len(results)}")
+        return 1
+
+    print(f"\n✓ Все {len(results)} запросов используют индексы")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
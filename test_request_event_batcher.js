@@ -0,0 +1,95 @@
+/*
+ * Проверка API.requestEventBatcher (front/api.js) на событиях веб-сокета
+ *
+ * Загружает front/api.js в Node без браузера, подменяет getRequest и
+ * проверяет, какие страницы обновятся на месте, а какие перезагрузятся.
+ *
+ * Запуск:
+ *     node test_request_event_batcher.js
+ */
+
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+
+const source = fs.readFileSync(path.join(__dirname, 'front', 'api.js'), 'utf8');
+const sandbox = { localStorage: { getItem: () => null }, setTimeout, clearTimeout, console };
+vm.runInNewContext(`${source}\nthis.API = API;`, sandbox);
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Отправляет события в батчер и возвращает, что получила страница
+async function deliver(events, existing = [1, 2, 3]) {
+    const api = new sandbox.API();
+    const fetched = [];
+    api.getRequest = async (id) => {
+        fetched.push(id);
+        if (!existing.includes(id)) throw new Error('Request not found');
+        return { id };
+    };
+    const page = { reloads: 0, requests: [], removed: [], fetched };
+    const onEvent = api.requestEventBatcher({
+        delay: 0,
+        onRequests: (requests, removedIds) => {
+            page.requests.push(...requests.map((request) => request.id));
+            page.removed.push(...removedIds);
+        },
+        onReload: () => { page.reloads += 1; }
+    });
+    events.forEach(onEvent);
+    await sleep(10);
+    return page;
+}
+
+const same = (a, b) => JSON.stringify([...a].sort()) === JSON.stringify([...b].sort());
+
+const scenarios = [
+    [
+        'изменения заявок применяются на месте',
+        [{ event: 'request_updated', request_id: 1 }, { event: 'request_created', request_id: 2 }],
+        (page) => page.reloads === 0 && same(page.requests, [1, 2]) && page.removed.length === 0
+    ],
+    [
+        'удаленная заявка убирается со страницы',
+        [{ event: 'request_updated', request_id: 1 }, { event: 'request_deleted', request_id: 1 }],
+        (page) => page.reloads === 0 && page.fetched.length === 0 && same(page.removed, [1])
+    ],
+    [
+        'импорт заявок (request_id: null) перезагружает список',
+        [{ event: 'requests_imported', request_id: null, client_id: null, executor_id: null, count: 5 }],
+        (page) => page.reloads === 1 && page.fetched.length === 0 && page.removed.length === 0
+    ],
+    [
+        'импорт вместе с изменением заявки перезагружает список',
+        [
+            { event: 'request_updated', request_id: 1 },
+            { event: 'requests_imported', request_id: null, client_id: null, executor_id: null, count: 5 }
+        ],
+        (page) => page.reloads === 1 && page.fetched.length === 0
+    ],
+    [
+        'событие без request_id (resync) перезагружает список',
+        [{ event: 'resync' }],
+        (page) => page.reloads === 1 && page.fetched.length === 0
+    ]
+];
+
+async function main() {
+    let failed = 0;
+    for (const [name, events, check] of scenarios) {
+        const page = await deliver(events);
+        if (check(page)) {
+            console.log(`✓ ${name}`);
+        } else {
+            failed += 1;
+            console.log(`✗ ${name}: ${JSON.stringify(page)}`);
+        }
+    }
+    if (failed) {
+        console.log(`\n✗ Сценариев с ошибками: ${failed} из ${scenarios.length}`);
+        process.exit(1);
+    }
+    console.log(`\n✓ Все ${scenarios.length} сценариев пройдены`);
+}
+
+main();
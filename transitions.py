@@ -0,0 +1,56 @@
+"""
+Request status state machine
+
+    NEW ──► ASSIGNED ──► IN_PROGRESS ──► COMPLETED
+     │          │             │
+     └──────────┴─────────────┴────────► CANCELLED
+
+PUT /api/requests/{id} applies a status change with one conditional
+statement, UPDATE requests SET ... WHERE id = :id AND status = :expected
+RETURNING ...: of two handlers racing on the same request only the first
+matches, the other gets 409 instead of silently overwriting it. Assigning
+an executor (NEW -> ASSIGNED) goes through the assign endpoints and
+automatic dispatch, which also set executor_id; the assign endpoints may
+also reassign an ASSIGNED or IN_PROGRESS request (ASSIGNABLE_STATUSES), and
+their UPDATE is conditional on those statuses in the same way.
+"""
+
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, status
+
+from models import RequestStatus
+
+REQUEST_TRANSITIONS: Dict[RequestStatus, Tuple[RequestStatus, ...]] = {
+    RequestStatus.NEW: (RequestStatus.ASSIGNED, RequestStatus.CANCELLED),
+    RequestStatus.ASSIGNED: (RequestStatus.IN_PROGRESS, RequestStatus.CANCELLED),
+    RequestStatus.IN_PROGRESS: (RequestStatus.COMPLETED, RequestStatus.CANCELLED),
+    RequestStatus.COMPLETED: (),
+    RequestStatus.CANCELLED: (),
+}
+
+
+def previous_statuses(target: RequestStatus) -> Tuple[RequestStatus, ...]:
+    """Statuses a request can move to `target` from"""
+    return tuple(source for source, targets in REQUEST_TRANSITIONS.items() if target in targets)
+
+
+# Statuses the assign endpoints accept: the sources of NEW -> ASSIGNED plus
+# reassignment of a request that already has an executor
+ASSIGNABLE_STATUSES = previous_statuses(RequestStatus.ASSIGNED) + (RequestStatus.ASSIGNED, RequestStatus.IN_PROGRESS)
+
+
+def transition_conflict(current: RequestStatus, target: RequestStatus) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Cannot change status from {current.value} to {target.value}"
+    )
+
+
+def check_transition(current: RequestStatus, target: RequestStatus):
+    """
+    Raises:
+        HTTPException: If the table has no current -> target transition
+    """
+    if target not in REQUEST_TRANSITIONS[current]:
+        raise transition_conflict(current, target)